@@ -0,0 +1,192 @@
+"""
+Micro-benchmarks for the signal hot path.
+
+    python -m benchmarks.bench_hot_path                          # run, print a table
+    python -m benchmarks.bench_hot_path --save baseline.json     # store a baseline
+    python -m benchmarks.bench_hot_path --compare baseline.json  # flag regressions
+
+Every case runs on deterministic synthetic candles (benchmarks/synthetic.py)
+at each window size. Timings are the median of repeated runs; --compare
+exits with status 1 when any case is slower than the baseline by more than
+--threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import SyntheticMarket, instrument_message
+
+DEFAULT_SIZES = (20, 100, 500, 1000, 5000, 10000)
+
+def build_cases(market, sizes):
+    """(name, size, setup) where setup() returns the zero-argument callable to time"""
+    from core import candle_decoder
+    from core.data_processor import DataProcessor
+    from core.strategy_engine import StrategyEngine
+    from strategies.trend_following import TrendFollowingStrategy
+    from strategies.trend_reversal import TrendReversalStrategy
+
+    processor = DataProcessor()
+    engine = StrategyEngine(processor)
+    engine.load_strategies()
+    strategies = {'trend_following': TrendFollowingStrategy('1m'), 'trend_reversal': TrendReversalStrategy('5m')}
+
+    cases = []
+    for size in sizes:
+        candles = market.candles(size)
+        frame = market.frame(size)
+
+        message = instrument_message('EURUSD', 60, candles)
+        cases.append(('json.loads', size, lambda m=message: lambda: candle_decoder.json.loads(m[2:])))
+        cases.append(('candle_decoder.decode_frame', size, lambda m=message: lambda: candle_decoder.decode_frame(m)))
+        cases.append(('candle_decoder.from_rows', size, lambda c=candles: lambda: candle_decoder.from_rows(c)))
+        cases.append(('DataProcessor.process_message', size, lambda m=message: lambda: processor.process_message(m)))
+        cases.append(('DataProcessor.process_message[event]', size,
+                      lambda e=('instruments/update', {'asset': 'EURUSD', 'period': 60, 'candles': candles}):
+                      lambda: processor.process_message(e)))
+        cases.append(('StrategyEngine._candles_to_dataframe', size,
+                      lambda c=candles: lambda: engine._candles_to_dataframe(c)))
+        cases.append(('StrategyEngine._candles_to_dataframe[columns]', size,
+                      lambda c=candle_decoder.from_rows(candles): lambda: engine._candles_to_dataframe(c)))
+        for period, label in ((60, 'trend_following'), (300, 'trend_reversal')):
+            data = {'type': 'instrument_update', 'asset': 'EURUSD', 'period': period, 'candles': candles}
+            cases.append((f'StrategyEngine.process_data[{label}]', size,
+                          lambda d=data: lambda: engine.process_data(dict(d))))
+
+        for label, strategy in strategies.items():
+            cases.append((f'{label}.calculate_indicators', size,
+                          lambda s=strategy, f=frame: lambda: s.calculate_indicators(f)))
+            cases.append((f'{label}.analyze', size, lambda s=strategy, f=frame: lambda: s.analyze(f)))
+
+        reversal = strategies['trend_reversal']
+        cases.append(('trend_reversal._calculate_fractals', size,
+                      lambda f=frame: lambda: reversal._calculate_fractals(f, 'high')))
+        cases.append(('trend_reversal._calculate_reversal_count', size,
+                      lambda f=frame: _reversal_count_case(reversal, f)))
+
+        cases.append(('BinaryOptionsStrategy.calculate_fractals', size,
+                      lambda f=frame: _binary_options_case(f, 'fractals')))
+        cases.append(('BinaryOptionsStrategy.calculate_reversal_count', size,
+                      lambda f=frame: _binary_options_case(f, 'reversal_count')))
+        cases.append(('BinaryOptionsStrategy.generate_signals', size,
+                      lambda f=frame: _binary_options_case(f, 'generate_signals')))
+    return cases
+
+def _reversal_count_case(strategy, frame):
+    df = frame.copy()
+    df['fractal_high'] = strategy._calculate_fractals(df, 'high')
+    df['fractal_low'] = strategy._calculate_fractals(df, 'low')
+    return lambda: strategy._calculate_reversal_count(df, 'buy')
+
+def _binary_options_case(frame, method):
+    from strategies.base_strategy import BinaryOptionsStrategy  # needs TA-Lib
+    # The strategy expects a positional index (it indexes columns with integers)
+    data = frame.reset_index()
+    if method == 'generate_signals':
+        strategy = BinaryOptionsStrategy(data, timeframe='1m')
+        return strategy.generate_signals
+    strategy = BinaryOptionsStrategy.__new__(BinaryOptionsStrategy)
+    strategy.data = data.copy()
+    strategy.timeframe = '5m'
+    if method == 'fractals':
+        return lambda: strategy.calculate_fractals('high')
+    strategy.data['fractal_low'] = strategy.calculate_fractals('low')
+    return lambda: strategy.calculate_reversal_count('buy')
+
+def measure(func, min_time=0.2, max_runs=50):
+    """Median and min seconds per call, running until min_time has been spent (at least 3 runs)"""
+    func()  # Warm-up, also surfaces errors before timing
+    timings = []
+    spent = 0.0
+    while len(timings) < 3 or (spent < min_time and len(timings) < max_runs):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        timings.append(elapsed)
+        spent += elapsed
+    return {'median': statistics.median(timings), 'min': min(timings), 'runs': len(timings)}
+
+def run(sizes, only=None, min_time=0.2):
+    market = SyntheticMarket(seed=42)
+    results = {}
+    for name, size, setup in build_cases(market, sizes):
+        if only and not any(pattern in name for pattern in only):
+            continue
+        key = f'{name}@{size}'
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                results[key] = measure(setup(), min_time=min_time)
+        except ImportError as e:
+            results[key] = {'skipped': str(e)}
+        except Exception as e:
+            results[key] = {'error': f'{type(e).__name__}: {e}'}
+        print(_format_row(key, results[key]), flush=True)
+    return results
+
+def compare(results, baseline, threshold):
+    """Cases slower than baseline by more than threshold (a fraction), as printable lines"""
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if not previous or 'median' not in previous or 'median' not in current:
+            continue
+        change = current['median'] / previous['median'] - 1
+        if change > threshold:
+            regressions.append(f"{key}: {_ms(previous['median'])} -> {_ms(current['median'])} (+{change:.0%})")
+    return regressions
+
+def _format_row(key, result):
+    if 'median' in result:
+        return f"{key:<60} {_ms(result['median']):>12} median {_ms(result['min']):>12} min  ({result['runs']} runs)"
+    return f"{key:<60} {result.get('error') or 'skipped: ' + result['skipped']}"
+
+def _ms(seconds):
+    return f"{seconds * 1000:.3f}ms"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hot-path micro-benchmarks")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated candle window sizes")
+    parser.add_argument('--only', action='append', help="only cases whose name contains this (repeatable)")
+    parser.add_argument('--min-time', type=float, default=0.2, help="seconds to spend per case")
+    parser.add_argument('--save', help="write results to this JSON baseline")
+    parser.add_argument('--compare', help="baseline JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="fractional slowdown that counts as a regression (default 0.10)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    results = run(sizes, args.only, args.min_time)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.platform(),
+                'created': time.time(),
+                'results': results
+            }, f, indent=2, sort_keys=True)
+        print(f"Saved {len(results)} results to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regressions above {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions above {args.threshold:.0%}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
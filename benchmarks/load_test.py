@@ -0,0 +1,255 @@
+"""
+End-to-end load test: synthetic feed -> bot pipeline -> dashboard clients.
+
+    python -m benchmarks.load_test --assets 16 --clients 20 --rate 50
+    python -m benchmarks.load_test --assets 64 --search --slo-p99-ms 250
+
+Runs the whole app in-process the way gunicorn's eventlet worker does
+(monkey patched). Instrument updates go through the same steps as a live
+WebSocket event:
+- decoding by the Socket.IO client's JSON module
+- QuotexWebSocketClient._deliver (candle conversion, the 'receive' stage)
+- main.process_websocket_message, the callback main.py wires up:
+  QuotexTradingBot.handle_message, then emit_signal (journal + dashboard)
+- batched emission to N Socket.IO test clients.
+
+Messages are sent open-loop at a fixed rate. Latency is measured from each
+message's scheduled arrival, so falling behind counts against it. Every
+message is traced:
+- no_signal: time until the pipeline decides there is no signal
+- signal: time until the batch carrying it is emitted to the clients
+
+The synthetic feed rarely makes the strategies fire, so by default every
+Nth analysis per strategy is turned into a signal (--signal-every, see
+synthetic.ForcedSignals) to keep the signal path measured. A step without
+any signal latency fails the SLO.
+
+--search doubles the rate until the SLO breaks, then bisects. It reports
+the highest sustainable rate and, for each rate, the CPU seconds spent per
+pipeline stage.
+"""
+import eventlet
+eventlet.monkey_patch()
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import (SyntheticMarket, assets as asset_names, client_event, force_signals,
+                                  instrument_message)
+
+def configure_environment(workdir):
+    """Keep the app's files in a scratch dir and the real bot from connecting"""
+    os.environ.setdefault('BOT_MODE', 'embedded')
+    os.environ['BOT_START_DELAY'] = '1e9'
+    os.environ['SIGNAL_JOURNAL_PATH'] = os.path.join(workdir, 'signals.db')
+    os.environ['BOT_CONFIG_PATH'] = os.path.join(workdir, 'trading_config.json')
+    os.environ.setdefault('LOG_DIR', os.path.join(workdir, 'logs'))
+
+class Feed:
+    """Pre-serialized instrument update frames, cycling through each asset's candle history"""
+    def __init__(self, assets, period, window, positions, seed=42):
+        market = SyntheticMarket(seed=seed)
+        self.assets = assets
+        self.frames = []
+        for asset in assets:
+            candles = market.candles(window + positions, period, asset)
+            self.frames.append([instrument_message(asset, period, candles[k:k + window])
+                                for k in range(positions)])
+        self.positions = positions
+
+    def frame(self, i):
+        per_asset = self.frames[i % len(self.assets)]
+        return per_asset[(i // len(self.assets)) % self.positions]
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, int(round(q * (len(values) - 1)))))
+    return values[index]
+
+def stamp_arrivals(bot):
+    """
+    Make handle_message stamp each message with its scheduled arrival instead
+    of the time it is reached, so latency also covers _deliver and any lag.
+    Returns a setter for the next message's arrival time
+    """
+    arrival = [None]
+    handle_message = bot.handle_message
+    bot.handle_message = lambda message, received=None: handle_message(message, received=arrival[0] or received)
+    return lambda scheduled: arrival.__setitem__(0, scheduled)
+
+def pipeline_errors(snapshot):
+    return sum(series['count'] for series in snapshot['errors'] if series['key'][0] == 'pipeline')
+
+def stage_totals(snapshot):
+    """{stage: (calls, seconds)} summed over all labels"""
+    totals = {}
+    for series in snapshot['histograms']:
+        calls, seconds = totals.get(series['key'][0], (0, 0.0))
+        totals[series['key'][0]] = (calls + series['count'], seconds + series['total'])
+    return totals
+
+def run_step(app_main, feed, clients, rate, duration, settle, set_arrival):
+    """Drive one fixed-rate step and return its latency, throughput and per-stage CPU numbers"""
+    from core.metrics import metrics
+    from core.tracing import tracer
+
+    ws_client = app_main.bot.ws_client
+    tracer._ring.clear()
+    snapshot = metrics.snapshot()
+    before, errors_before = stage_totals(snapshot), pipeline_errors(snapshot)
+    cpu_start = time.process_time()
+
+    count = int(rate * duration)
+    start = time.time()
+    max_lag = 0.0
+    for i in range(count):
+        scheduled = start + i / rate
+        now = time.time()
+        if now < scheduled:
+            time.sleep(scheduled - now)
+        else:
+            max_lag = max(max_lag, now - scheduled)
+            time.sleep(0)  # Let the emitter and client tasks run even when behind
+        # As the Socket.IO client hands over an event; the callback logs and counts errors
+        set_arrival(scheduled)
+        ws_client._deliver(*client_event(feed.frame(i)))
+    sent_for = time.time() - start
+    time.sleep(settle)  # Let the last emission window flush
+
+    cpu = time.process_time() - cpu_start
+    snapshot = metrics.snapshot()
+    after, errors = stage_totals(snapshot), pipeline_errors(snapshot) - errors_before
+    records = tracer.recent(len(tracer._ring))
+    all_ms = [r['pipeline_ms'] for r in records]
+    signal_ms = [r['pipeline_ms'] for r in records if r['stages'][-1]['stage'] == 'emit']
+    frames = sum(len(client.get_received()) for client in clients)
+
+    stages = {}
+    for stage, (calls, seconds) in after.items():
+        prev_calls, prev_seconds = before.get(stage, (0, 0.0))
+        if calls > prev_calls and stage != 'bridge_lag':  # Waiting time, not CPU
+            stages[stage] = {'calls': calls - prev_calls, 'cpu_s': round(seconds - prev_seconds, 4),
+                             'share': round((seconds - prev_seconds) / cpu, 3) if cpu else None}
+
+    return {
+        'rate': rate,
+        'messages': count,
+        'achieved_rate': round(count / sent_for, 1) if sent_for else None,
+        'max_lag_ms': round(max_lag * 1000, 1),
+        'errors': errors,
+        'signals': len(signal_ms),
+        'client_frames': frames,
+        'latency_ms': {q: percentile(all_ms, p) for q, p in (('p50', 0.5), ('p99', 0.99), ('p99.9', 0.999))},
+        'signal_latency_ms': {q: percentile(signal_ms, p) for q, p in (('p50', 0.5), ('p99', 0.99), ('p99.9', 0.999))},
+        'cpu_s': round(cpu, 3),
+        'stages': stages
+    }
+
+def within_slo(result, slo_p99_ms):
+    """p99 of all messages and of signals within the SLO at the offered rate; no signals measured fails"""
+    p99 = result['latency_ms']['p99']
+    signal_p99 = result['signal_latency_ms']['p99']
+    return (p99 is not None and p99 <= slo_p99_ms
+            and signal_p99 is not None and signal_p99 <= slo_p99_ms
+            and result['achieved_rate'] >= 0.95 * result['rate'])
+
+def print_result(result, slo_p99_ms):
+    latency, signal_latency = result['latency_ms'], result['signal_latency_ms']
+    fmt = lambda v: '-' if v is None else f'{v:.1f}'
+    verdict = 'OK ' if within_slo(result, slo_p99_ms) else 'SLO'
+    print(f"{verdict} rate {result['rate']:>8.1f}/s achieved {result['achieved_rate']:>8.1f}/s "
+          f"p50 {fmt(latency['p50'])} p99 {fmt(latency['p99'])} p99.9 {fmt(latency['p99.9'])} ms | "
+          f"signals {result['signals']} p99 {fmt(signal_latency['p99'])} ms | "
+          f"lag {result['max_lag_ms']} ms | cpu {result['cpu_s']}s", flush=True)
+    if signal_latency['p99'] is None:
+        print("    WARNING: no signal reached the clients, the emission path was not measured "
+              "(use --signal-every to force signals)", flush=True)
+    for stage, numbers in sorted(result['stages'].items(), key=lambda item: -item[1]['cpu_s']):
+        print(f"      {stage:<16} {numbers['calls']:>8} calls {numbers['cpu_s']:>9.3f}s "
+              f"{(numbers['share'] or 0):>6.1%} of cpu")
+
+def search(step, start_rate, slo_p99_ms, max_steps):
+    """Double until the SLO breaks, then bisect; returns (best rate, all results)"""
+    good, bad, rate, results = None, None, start_rate, []
+    for _ in range(max_steps):
+        result = step(rate)
+        results.append(result)
+        print_result(result, slo_p99_ms)
+        if within_slo(result, slo_p99_ms):
+            good = rate
+            rate = rate * 2 if bad is None else (good + bad) / 2
+        else:
+            bad = rate
+            rate = (good + bad) / 2 if good else rate / 2
+        if good and bad and bad / good < 1.1:
+            break
+    return good, results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="End-to-end load test of the signal pipeline")
+    parser.add_argument('--assets', type=int, default=16, help="number of assets in the feed")
+    parser.add_argument('--clients', type=int, default=10, help="simulated dashboard clients")
+    parser.add_argument('--period', type=int, default=60, help="candle period in seconds")
+    parser.add_argument('--window', type=int, default=100, help="candles per instrument update")
+    parser.add_argument('--rate', type=float, default=20.0, help="messages per second (start rate with --search)")
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds per rate step")
+    parser.add_argument('--search', action='store_true', help="search for the highest rate within the SLO")
+    parser.add_argument('--max-steps', type=int, default=8)
+    parser.add_argument('--slo-p99-ms', type=float, default=250.0, help="p99 end-to-end latency SLO")
+    parser.add_argument('--emit-window-ms', type=float, help="override the dashboard emission window")
+    parser.add_argument('--signal-every', type=int, default=25,
+                        help="turn every Nth analysis per strategy into a signal (0 = real signals only)")
+    parser.add_argument('--json', help="write all step results to this file")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='quotex-load-')
+    configure_environment(workdir)
+    import main as app_main
+    from core.tracing import tracer
+    from dashboard.app import app, socketio, emitter
+
+    tracer.sample_rate = 1.0
+    tracer._ring = deque(maxlen=int(args.rate * args.duration * 2 ** args.max_steps) + 1000)
+    if args.emit_window_ms is not None:
+        emitter.window = args.emit_window_ms / 1000.0
+    settle = emitter.window + 0.2
+    if args.signal_every > 0:
+        force_signals(app_main.bot.strategy_engine, args.signal_every)
+    set_arrival = stamp_arrivals(app_main.bot)
+
+    clients = [socketio.test_client(app) for _ in range(args.clients)]
+    feed = Feed(asset_names(args.assets), args.period, args.window, positions=200)
+    print(f"{args.assets} assets, {args.clients} clients, {args.window} candles per update, "
+          f"SLO p99 <= {args.slo_p99_ms}ms (scratch dir {workdir})")
+
+    # Warm up imports, strategies and caches before measuring
+    run_step(app_main, feed, clients, rate=min(args.rate, 20.0), duration=1.0, settle=settle,
+             set_arrival=set_arrival)
+
+    step = lambda rate: run_step(app_main, feed, clients, rate, args.duration, settle, set_arrival)
+    if args.search:
+        best, results = search(step, args.rate, args.slo_p99_ms, args.max_steps)
+        print(f"\nHighest sustainable rate: {best or 'none'} msg/s "
+              f"({(best or 0) / args.assets:.2f} updates/s per asset)")
+    else:
+        results = [step(args.rate)]
+        print_result(results[0], args.slo_p99_ms)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    for client in clients:
+        client.disconnect()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""
+Memory soak test: days of simulated feed in compressed time.
+
+    python -m benchmarks.soak_test --days 3 --assets 16
+    python -m benchmarks.soak_test --days 1 --assets 64 --max-growth-kb 64
+
+Every simulated minute each asset gets a tick and an instrument update. Each
+update carries the asset's latest --window candles, with timestamps
+advancing in simulated time. Messages go through the same pipeline as the
+WebSocket callback in main.py, and also into the helper pipeline's
+CandleStore. Every --signal-every analyses per strategy become a signal
+(see synthetic.ForcedSignals), so the journal, the outcome tracker, the
+dashboard signal ring and the outcome path all carry load.
+
+Warm-up lasts at least --warmup-hours and until every fixed-size buffer is
+full (trace ring, dashboard signal ring, engine signal history, chart
+windows), so their filling up is not counted as growth.
+
+It reports:
+- per asset, traced growth per simulated day and RSS growth after warm-up
+  (the process's total peak RSS is mostly interpreter and libraries, so it
+  is only reported as a whole)
+- tracemalloc growth per module and per call site, measured against a
+  snapshot taken after warm-up
+- the size of the log directory
+
+Exit status: 0 when memory per asset is bounded, 1 when traced memory keeps
+growing after warm-up by more than --max-growth-kb per asset per simulated
+day, 2 when the run is inconclusive (warm-up never finished, or too few
+samples after it to fit a trend).
+"""
+import eventlet
+eventlet.monkey_patch()
+
+import argparse
+import gc
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.load_test import configure_environment
+from benchmarks.synthetic import (SyntheticMarket, assets as asset_names, client_event, force_signals,
+                                  instrument_message, tick_message)
+
+def rss_kb():
+    """Current resident set size in KB (Linux), None elsewhere"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+
+def peak_rss_kb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def directory_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+def growth_slope(samples):
+    """Least-squares slope of (hours, bytes) samples, in bytes per simulated hour"""
+    if len(samples) < 2:
+        return 0.0
+    n = len(samples)
+    mean_x = sum(x for x, _ in samples) / n
+    mean_y = sum(y for _, y in samples) / n
+    var_x = sum((x - mean_x) ** 2 for x, _ in samples)
+    if not var_x:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in samples) / var_x
+
+def unfilled_buffers(app_main):
+    """Names of the fixed-size buffers that are not at capacity yet"""
+    from core.tracing import tracer
+    from dashboard.app import charts, dashboard
+    engine = app_main.bot.strategy_engine
+    full = {
+        'trace ring': len(tracer._ring) >= tracer._ring.maxlen,
+        'dashboard signal ring': len(dashboard._signals) >= dashboard._signals.capacity,
+        'engine signal history': len(engine.signals) >= engine.max_signals_history,
+        'chart windows': bool(charts._candles) and all(len(c) >= c.maxlen for c in charts._candles.values())
+    }
+    return [name for name, is_full in full.items() if not is_full]
+
+def top_growth(snapshot, baseline, key_type, limit):
+    # Leave out the memory tracemalloc itself uses for the snapshots
+    own = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    stats = snapshot.filter_traces(own).compare_to(baseline.filter_traces(own), key_type)
+    return [
+        {'where': str(stat.traceback[0]) if key_type == 'lineno' else stat.traceback[0].filename,
+         'size_diff_kb': round(stat.size_diff / 1024, 1), 'size_kb': round(stat.size / 1024, 1),
+         'count_diff': stat.count_diff}
+        for stat in stats[:limit] if stat.size_diff
+    ]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memory soak test of the signal pipeline")
+    parser.add_argument('--days', type=float, default=1.0, help="simulated days of feed")
+    parser.add_argument('--assets', type=int, default=16)
+    parser.add_argument('--period', type=int, default=60, help="candle period in seconds")
+    parser.add_argument('--window', type=int, default=100, help="candles per instrument update")
+    parser.add_argument('--snapshot-hours', type=float, default=2.0, help="simulated hours between snapshots")
+    parser.add_argument('--warmup-hours', type=float, default=3.0,
+                        help="minimum simulated hours before the baseline (warm-up also waits for full buffers)")
+    parser.add_argument('--signal-every', type=int, default=10,
+                        help="turn every Nth analysis per strategy into a signal (0 = real signals only)")
+    parser.add_argument('--frames', type=int, default=1, help="traceback depth recorded by tracemalloc")
+    parser.add_argument('--max-growth-kb', type=float, default=64.0,
+                        help="allowed traced growth per asset per simulated day after warm-up")
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--json', help="write the report to this file")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='quotex-soak-')
+    configure_environment(workdir)
+    import main as app_main
+    from core.tracing import tracer
+    from utils.candle_store import CandleStore
+
+    # Trace every message so the bounded trace ring fills during warm-up
+    tracer.sample_rate = 1.0
+
+    bot, emit_signal = app_main.bot, app_main.emit_signal
+    if args.signal_every > 0:
+        force_signals(bot.strategy_engine, args.signal_every)
+    helper_store = CandleStore(capacity=200)
+    assets = asset_names(args.assets)
+    market = SyntheticMarket(seed=7)
+    steps = int(args.days * 24 * 3600 / args.period)
+    series = {asset: market.candles(args.window + steps, args.period, asset) for asset in assets}
+    print(f"{args.assets} assets, {args.days} simulated days ({steps} updates per asset), scratch dir {workdir}")
+
+    tracemalloc.start(args.frames)
+    baseline = None
+    baseline_rss = None
+    samples = []   # (simulated hours, traced bytes) after warm-up
+    snapshots = []
+    step_hours = args.period / 3600.0
+    next_snapshot = args.warmup_hours
+    wall_start = time.time()
+    errors = 0
+    signals = 0
+    unfilled = []
+
+    for step in range(steps):
+        for asset in assets:
+            candles = series[asset][step:step + args.window]
+            last = candles[-1]
+            try:
+                bot.handle_message(client_event(tick_message({'symbol': asset, 'price': last[4], 'timestamp': last[0]})))
+                signal = bot.handle_message(client_event(instrument_message(asset, args.period, candles)))
+                if signal:
+                    emit_signal(signal)
+                    signals += 1
+                helper_store.add(asset, args.period, {'time': last[0], 'open': last[1], 'high': last[2],
+                                                      'low': last[3], 'close': last[4]})
+            except Exception:
+                errors += 1
+        time.sleep(0)  # Let the emitter, journal and logging tasks run
+
+        hours = (step + 1) * step_hours
+        if hours >= next_snapshot:
+            next_snapshot += args.snapshot_hours
+            if baseline is None:
+                unfilled = unfilled_buffers(app_main)
+                if unfilled:
+                    print(f"  {hours:7.1f}h still warming up, not full: {', '.join(unfilled)}", flush=True)
+                    continue
+                print(f"  {hours:7.1f}h warm-up done, buffers full", flush=True)
+            gc.collect()  # Pandas frames are freed by the cycle collector, don't count them as growth
+            if baseline is None:
+                # Taken before the first reading so its own memory is in every sample
+                baseline = tracemalloc.take_snapshot()
+                baseline_rss = rss_kb()  # After the snapshot, so its memory is not counted as growth
+            current, peak = tracemalloc.get_traced_memory()
+            samples.append((hours, current))
+            snapshots.append({'sim_hours': round(hours, 2), 'traced_kb': current // 1024,
+                              'traced_peak_kb': peak // 1024, 'rss_kb': rss_kb(),
+                              'wall_s': round(time.time() - wall_start, 1)})
+            print(f"  {hours:7.1f}h traced {current / 1024:9.0f} KB  rss {rss_kb()} KB  "
+                  f"({time.time() - wall_start:.0f}s wall)", flush=True)
+
+    time.sleep(1.0)  # Flush journal and log queues before the final snapshot
+    gc.collect()
+    final = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    slope = growth_slope(samples)
+    growth_per_asset_day_kb = slope * 24 / 1024 / args.assets
+    peak_kb = peak_rss_kb()
+    # Last sample rather than now, the final snapshot inflates RSS on its own
+    rss_growth_kb = snapshots[-1]['rss_kb'] - baseline_rss if baseline_rss else None
+    measured_hours = samples[-1][0] - samples[0][0] if samples else 0.0
+    report = {
+        'assets': args.assets,
+        'simulated_days': args.days,
+        'messages': steps * args.assets * 2,
+        'signals': signals,
+        'errors': errors,
+        'wall_seconds': round(time.time() - wall_start, 1),
+        'snapshots': snapshots,
+        'measured_sim_hours': round(measured_hours, 2),
+        'growth_per_asset_per_day_kb': round(growth_per_asset_day_kb, 2),
+        'rss_growth_per_asset_kb': round(rss_growth_kb / args.assets, 1) if rss_growth_kb is not None else None,
+        'rss_growth_per_asset_per_day_kb': (round(rss_growth_kb / args.assets / measured_hours * 24, 1)
+                                            if rss_growth_kb is not None and measured_hours else None),
+        'rss_after_warmup_kb': baseline_rss,
+        'peak_rss_kb': peak_kb,
+        'log_dir_kb': directory_size(os.environ['LOG_DIR']) // 1024,
+        'top_modules': top_growth(final, baseline, 'filename', args.top) if baseline else [],
+        'top_call_sites': top_growth(final, baseline, 'lineno', args.top) if baseline else []
+    }
+
+    print(f"\nPer asset after warm-up ({measured_hours:.1f} simulated hours): "
+          f"traced {growth_per_asset_day_kb:+.2f} KB per day, "
+          f"RSS {report['rss_growth_per_asset_kb']} KB ({report['rss_growth_per_asset_per_day_kb']} KB per day)")
+    print(f"Process: peak RSS {peak_kb} KB, log dir {report['log_dir_kb']} KB, "
+          f"{signals} signals, {errors} errors")
+    for title, key in (('modules', 'top_modules'), ('call sites', 'top_call_sites')):
+        print(f"Top growth by {title}:")
+        for entry in report[key]:
+            print(f"  {entry['size_diff_kb']:>+10.1f} KB  {entry['count_diff']:>+8} blocks  {entry['where']}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if len(samples) < 2:
+        if unfilled:
+            reason = f"warm-up never finished, not full: {', '.join(unfilled)}"
+        else:
+            reason = f"{len(samples)} sample(s) after warm-up, need 2"
+        print(f"INCONCLUSIVE: {reason}; run longer (--days) or force signals (--signal-every)")
+        return 2
+    if growth_per_asset_day_kb > args.max_growth_kb:
+        print(f"FAIL: memory grows {growth_per_asset_day_kb:.1f} KB per asset per day "
+              f"(limit {args.max_growth_kb} KB)")
+        return 1
+    print("PASS: memory per asset is bounded")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
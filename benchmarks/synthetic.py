@@ -0,0 +1,109 @@
+import json
+import random
+
+# Fixed reference time so generated data (and benchmark inputs) never change between runs
+START_TIME = 1700000000
+
+class SyntheticMarket:
+    """
+    Deterministic synthetic price feed.
+
+    Prices follow a seeded random walk with slow trend swings, so strategies
+    see trends, pullbacks and fractals rather than pure noise. The same seed
+    always produces the same candles, ticks and messages.
+    """
+    def __init__(self, seed=42, base_price=1.1, volatility=0.0008):
+        self.seed = seed
+        self.base_price = base_price
+        self.volatility = volatility
+
+    def candles(self, count, period=60, asset='EURUSD', start=START_TIME):
+        """[timestamp, open, high, low, close, volume] rows, the format the broker sends"""
+        rng = random.Random(f"{self.seed}:{asset}:{period}")
+        price = self.base_price * (1 + rng.uniform(-0.05, 0.05))
+        drift = 0.0
+        rows = []
+        for i in range(count):
+            if i % 50 == 0:
+                drift = rng.uniform(-0.5, 0.5) * self.volatility
+            open_ = price
+            close = max(open_ * (1 + drift + rng.gauss(0, self.volatility)), 1e-6)
+            high = max(open_, close) * (1 + abs(rng.gauss(0, self.volatility / 2)))
+            low = min(open_, close) * (1 - abs(rng.gauss(0, self.volatility / 2)))
+            rows.append([start + i * period, round(open_, 6), round(high, 6), round(low, 6),
+                         round(close, 6), rng.randint(10, 500)])
+            price = close
+        return rows
+
+    def frame(self, count, period=60, asset='EURUSD'):
+        """Candles as the timestamp-indexed OHLCV DataFrame strategies receive"""
+        import pandas as pd
+        df = pd.DataFrame(self.candles(count, period, asset),
+                          columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s')
+        return df.set_index('timestamp')
+
+    def ticks(self, count, asset='EURUSD', start=START_TIME, interval=0.25):
+        """{'symbol', 'price', 'timestamp'} tick payloads"""
+        rng = random.Random(f"{self.seed}:{asset}:ticks")
+        price = self.base_price
+        ticks = []
+        for i in range(count):
+            price *= 1 + rng.gauss(0, self.volatility / 4)
+            ticks.append({'symbol': asset, 'price': round(price, 6), 'timestamp': start + i * interval})
+        return ticks
+
+def assets(count):
+    """count asset names, real symbols first then numbered synthetic OTC ones"""
+    from config.settings import TRADING_SETTINGS
+    names = list(TRADING_SETTINGS['assets'])[:count]
+    names += [f"SYN{i:03d}_otc" for i in range(count - len(names))]
+    return names
+
+def instrument_message(asset, period, candles):
+    """Raw Socket.IO frame of an 'instruments/update' event"""
+    return '42' + json.dumps(['instruments/update', {'asset': asset, 'period': period, 'candles': candles}])
+
+def tick_message(tick):
+    """Raw Socket.IO frame of a 'tick' event"""
+    return '42' + json.dumps(['tick', tick])
+
+def client_event(frame):
+    """(event, data) of a raw frame, decoded the way the Socket.IO client hands it to _deliver"""
+    from core.candle_decoder import json_module
+    event, data = json_module().loads(frame[2:])
+    return event, data
+
+class ForcedSignals:
+    """
+    Strategy wrapper that turns every Nth 'hold' into a signal.
+
+    The real analyze() always runs first, so the strategy cost is unchanged,
+    and everything after it (confidence filter, trade details, outcome
+    tracking, journal, dashboard) is the real signal path. Lets benchmarks
+    measure signal latency on a feed where the strategies rarely fire.
+    """
+    def __init__(self, strategy, every):
+        self._strategy = strategy
+        self.every = every
+        self.calls = 0
+
+    def __getattr__(self, name):
+        return getattr(self._strategy, name)
+
+    def analyze(self, df):
+        signal = self._strategy.analyze(df)
+        self.calls += 1
+        if self.calls % self.every == 0 and signal.get('signal') == 'hold':
+            direction = 'buy' if (self.calls // self.every) % 2 else 'sell'
+            signal = {'signal': direction, 'confidence': 100, 'forced': True}
+        return signal
+
+def force_signals(engine, every):
+    """Wrap each of the engine's strategies in ForcedSignals, returns the wrappers"""
+    engine.load_strategies()
+    engine.strategies = {
+        key: strategy if isinstance(strategy, ForcedSignals) else ForcedSignals(strategy, every)
+        for key, strategy in engine.strategies.items()
+    }
+    return list(engine.strategies.values())
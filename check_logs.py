@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CHILD = "from utils.logger import setup_logger; setup_logger('check_logs').info('started')"
+
+def start_process(log_dir):
+    """Run one short-lived process that logs a line, as a restart or recycled worker would"""
+    env = dict(os.environ, LOG_DIR=log_dir, PYTHONPATH=BASE_DIR)
+    subprocess.run([sys.executable, '-c', CHILD], env=env, cwd=BASE_DIR, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return sorted(os.listdir(log_dir))
+
+def check_logs():
+    log_dir = tempfile.mkdtemp(prefix='quotex-logs-')
+    print(f"Checking log files in {log_dir}...")
+
+    first = start_process(log_dir)
+    print(f"After the first start: {first}")
+    # A backup left by rotation belongs to the same (now gone) process
+    if first:
+        open(os.path.join(log_dir, first[0] + '.1'), 'w').close()
+    second = start_process(log_dir)
+    print(f"After the second start: {second}")
+
+    ok = len(first) == 1 and len(second) == 1 and first != second
+    print("✓ Log files of exited processes are removed" if ok else "❌ Log files pile up across restarts")
+    return ok
+
+if __name__ == "__main__":
+    check_logs()
@@ -0,0 +1,79 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from utils.notifier import TelegramNotifier
+
+class StubTelegram(BaseHTTPRequestHandler):
+    """Answers sendMessage with the next queued (status, body) and records the requests"""
+    responses = []
+    received = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        StubTelegram.received.append((self.path, body))
+        status, payload = StubTelegram.responses.pop(0) if StubTelegram.responses else (200, {'ok': True})
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+def check(name, condition):
+    print(f"{'✓' if condition else '❌'} {name}")
+    return condition
+
+def check_notifier():
+    server = HTTPServer(('127.0.0.1', 0), StubTelegram)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_base = f"http://127.0.0.1:{server.server_port}"
+    signal = {'asset': 'EURUSD', 'signal': 'buy', 'timeframe': '1m', 'confidence': 80, 'timestamp': '12:00'}
+    ok = True
+
+    try:
+        print("Checking Telegram notifier against a local stub server...")
+        notifier = TelegramNotifier(token='TOKEN', chat_id='42', api_base=api_base,
+                                    batch_window=0.2, min_interval=0, max_retries=3)
+
+        # A burst is merged into one message
+        StubTelegram.received.clear()
+        for _ in range(3):
+            notifier.submit(signal)
+        deadline = time.monotonic() + 5
+        while notifier.sent < 1 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        ok &= check("burst sent as one message", notifier.sent == 1 and len(StubTelegram.received) == 1)
+        path, body = StubTelegram.received[0] if StubTelegram.received else ('', {})
+        ok &= check("posted to /botTOKEN/sendMessage", path == '/botTOKEN/sendMessage' and body.get('chat_id') == '42')
+        ok &= check("message lists every signal", body.get('text', '').startswith('3 new signals:'))
+
+        # 429 honours retry_after, then succeeds
+        StubTelegram.received.clear()
+        StubTelegram.responses = [(429, {'ok': False, 'parameters': {'retry_after': 0.1}})]
+        ok &= check("retried after 429", notifier._send_with_retry('x') and len(StubTelegram.received) == 2)
+
+        # 400 is not retried
+        StubTelegram.received.clear()
+        StubTelegram.responses = [(400, {'ok': False, 'description': 'chat not found'})]
+        ok &= check("400 not retried", not notifier._send_with_retry('x') and len(StubTelegram.received) == 1)
+
+        # Server errors use every attempt, with no backoff after the last one (1s + 2s in between)
+        StubTelegram.received.clear()
+        StubTelegram.responses = [(500, {'ok': False})] * 3
+        start = time.monotonic()
+        sent = notifier._send_with_retry('x')
+        elapsed = time.monotonic() - start
+        ok &= check(f"gave up after {len(StubTelegram.received)} attempts", not sent and len(StubTelegram.received) == 3)
+        ok &= check(f"no sleep after the last attempt ({elapsed:.1f}s)", elapsed < 3.5)
+    finally:
+        server.shutdown()
+
+    print("✓ Notifier OK" if ok else "❌ Notifier check failed")
+    return ok
+
+if __name__ == "__main__":
+    check_notifier()
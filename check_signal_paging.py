@@ -0,0 +1,43 @@
+import os
+import sys
+import tempfile
+
+def check(name, condition):
+    print(f"{'✓' if condition else '❌'} {name}")
+    return condition
+
+def check_signal_paging(count=12, limit=5):
+    workdir = tempfile.mkdtemp(prefix='quotex-paging-')
+    os.environ.setdefault('LOG_DIR', os.path.join(workdir, 'logs'))
+    os.environ['SIGNAL_JOURNAL_PATH'] = os.path.join(workdir, 'signals.db')
+    from dashboard.app import app, dashboard
+
+    print(f"Checking /api/signals paging over {count} new signals with limit {limit}...")
+    client = app.test_client()
+    since = int(client.get('/api/signals').headers['X-Last-Id'])
+    for i in range(count):
+        # Straight onto the dashboard, as the bridge would on the web loop
+        dashboard._add_signal({'asset': f'ASSET{i}', 'signal': 'buy'})
+
+    received, pages = [], 0
+    while True:
+        response = client.get(f'/api/signals?since={since}&limit={limit}')
+        page = response.json
+        if not page:
+            break
+        pages += 1
+        ok_order = [s['id'] for s in page] == sorted((s['id'] for s in page), reverse=True)
+        if not check(f"page {pages}: {len(page)} signals, newest first", len(page) <= limit and ok_order):
+            return False
+        received.extend(s['id'] for s in page)
+        since = max(s['id'] for s in page)
+
+    last_id = int(response.headers['X-Last-Id'])
+    ok = check(f"{len(received)} signals in {pages} pages, none missed or repeated",
+               sorted(received) == list(range(last_id - count + 1, last_id + 1)))
+    ok &= check("paging stops at X-Last-Id", since == last_id)
+    print("✓ Paging OK" if ok else "❌ Paging check failed")
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if check_signal_paging() else 1)
@@ -14,6 +14,14 @@ class Credentials:
     _ws_url = os.getenv('QUOTEX_WS_URL', '')
     WS_URL = _ws_url if _ws_url and _ws_url.strip() else 'https://ws2.qxbroker.com'
 
+    # Telegram notifications (disabled when token or chat id is missing)
+    TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN', '')
+    TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID', '')
+    TELEGRAM_API_BASE = os.getenv('TELEGRAM_API_BASE', 'https://api.telegram.org')
+
+    # Bearer token for the /admin endpoints (disabled when empty)
+    ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')
+
     @classmethod
     def validate(cls):
         if not cls.SESSION_ID and (not cls.EMAIL or not cls.PASSWORD):
@@ -0,0 +1,202 @@
+import copy
+import json
+import os
+import queue
+import threading
+from config.settings import TRADING_SETTINGS, STRATEGY_SETTINGS, LIVE_CONFIG_SETTINGS
+from utils.logger import setup_logger
+
+logger = setup_logger('live_config')
+
+# Timeframes the broker subscription and strategy engine understand
+KNOWN_TIMEFRAMES = ('1m', '2m', '3m', '5m')
+
+class LiveConfig:
+    """
+    Trading configuration that can change while the bot runs.
+
+    The assets, timeframes and strategy settings are read from a JSON file
+    (when it exists) on top of the defaults in config/settings.py. A watcher
+    thread reloads the file when it changes, and submit() lets the admin
+    endpoint change it: the update is validated right away and applied by a
+    background thread, so the request never waits on the listeners. Accepted
+    changes are written into
+    TRADING_SETTINGS/STRATEGY_SETTINGS in place and listeners are called with
+    the old and new configuration so they can apply only the difference.
+
+    Listeners run after the settings lock is released (they may reconnect
+    and sleep), one change at a time and in the order the changes were made.
+    """
+    def __init__(self, path=None, poll_interval=None):
+        self.path = path or LIVE_CONFIG_SETTINGS['path']
+        self.poll_interval = poll_interval or LIVE_CONFIG_SETTINGS['poll_interval']
+        self.version = 0
+        self._listeners = []
+        self._mtime = None
+        self._watcher = None
+        self._applier = None
+        self._submitted = queue.Queue()
+        self._lock = threading.RLock()         # Guards the settings swap only
+        self._notify_lock = threading.Lock()   # Keeps listener calls in change order
+        self._start_lock = threading.Lock()
+
+    @property
+    def pending(self):
+        """Submitted changes not applied yet"""
+        return self._submitted.unfinished_tasks
+
+    def current(self):
+        """The live configuration as a plain dict"""
+        return {
+            'assets': list(TRADING_SETTINGS['assets']),
+            'timeframes': list(TRADING_SETTINGS['timeframes']),
+            'strategies': copy.deepcopy(STRATEGY_SETTINGS)
+        }
+
+    def subscribe(self, callback):
+        """Call callback(old, new) after each applied change"""
+        self._listeners.append(callback)
+
+    def load(self):
+        """Apply the config file if it exists and changed since the last load"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return False
+        if mtime == self._mtime:
+            return False
+        try:
+            with open(self.path) as f:
+                update = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Cannot read config file {self.path}: {e}")
+            return False
+        self._mtime = mtime
+        try:
+            return self.apply(update, persist=False)
+        except ValueError as e:
+            logger.error(f"Rejected config file {self.path}: {e}")
+            return False
+
+    def apply(self, update, persist=True):
+        """
+        Validate and apply a partial config (any of assets, timeframes,
+        strategies). Raises ValueError on invalid input, returns True if
+        anything changed.
+        """
+        with self._notify_lock:
+            with self._lock:
+                old = self.current()
+                new = validate(update, old)
+                if new == old:
+                    return False
+
+                TRADING_SETTINGS['assets'] = new['assets']
+                TRADING_SETTINGS['timeframes'] = new['timeframes']
+                STRATEGY_SETTINGS.clear()
+                STRATEGY_SETTINGS.update(new['strategies'])
+                self.version += 1
+                version = self.version
+                if persist:
+                    self._write(new)
+
+            logger.info(f"Applied config version {version}: {len(new['assets'])} assets, "
+                        f"timeframes {new['timeframes']}")
+            # Outside the settings lock, so submit() and readers never wait on a listener
+            for callback in self._listeners:
+                try:
+                    callback(old, new)
+                except Exception as e:
+                    logger.error(f"Error applying config change: {e}")
+            return True
+
+    def submit(self, update):
+        """
+        Validate a partial config against the current one and queue it for
+        the applier thread. Raises ValueError on invalid input; the change
+        shows up as a new version once applied.
+        """
+        validate(update, self.current())
+        self._submitted.put(update)
+        if self._applier is None:
+            with self._start_lock:
+                if self._applier is None:
+                    self._applier = threading.Thread(target=self._apply_loop, name='config-applier', daemon=True)
+                    self._applier.start()
+
+    def _apply_loop(self):
+        while True:
+            update = self._submitted.get()
+            try:
+                self.apply(update)
+            except ValueError as e:
+                # Valid when submitted, but an earlier change made it invalid
+                logger.error(f"Rejected submitted config: {e}")
+            except Exception as e:
+                logger.error(f"Error applying submitted config: {e}")
+            finally:
+                self._submitted.task_done()
+
+    def start_watching(self):
+        """Start the file watcher thread once"""
+        with self._lock:
+            if self._watcher is None:
+                self._watcher = threading.Thread(target=self._watch_loop, name='config-watcher', daemon=True)
+                self._watcher.start()
+
+    def _watch_loop(self):
+        stop = threading.Event()
+        while not stop.wait(self.poll_interval):
+            self.load()
+
+    def _write(self, config):
+        """Write atomically so the watchers never read a half-written file"""
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(config, f, indent=2)
+        os.replace(tmp_path, self.path)
+        # Our own write is already applied, skip it in the watcher
+        self._mtime = os.path.getmtime(self.path)
+
+def validate(update, base):
+    """Merge a partial config over base, raising ValueError on anything invalid"""
+    if not isinstance(update, dict):
+        raise ValueError("config must be a JSON object")
+    unknown = set(update) - {'assets', 'timeframes', 'strategies'}
+    if unknown:
+        raise ValueError(f"unknown config keys: {sorted(unknown)}")
+
+    config = copy.deepcopy(base)
+    if 'assets' in update:
+        assets = update['assets']
+        if not isinstance(assets, list) or not all(isinstance(a, str) and a for a in assets):
+            raise ValueError("assets must be a list of asset names")
+        config['assets'] = list(dict.fromkeys(assets))
+
+    if 'timeframes' in update:
+        timeframes = update['timeframes']
+        if not isinstance(timeframes, list) or not set(timeframes) <= set(KNOWN_TIMEFRAMES):
+            raise ValueError(f"timeframes must be a list drawn from {list(KNOWN_TIMEFRAMES)}")
+        config['timeframes'] = list(dict.fromkeys(timeframes))
+
+    for name, settings in (update.get('strategies') or {}).items():
+        if name not in config['strategies']:
+            raise ValueError(f"unknown strategy: {name}")
+        if not isinstance(settings, dict):
+            raise ValueError(f"settings for {name} must be an object")
+        merged = dict(config['strategies'][name], **settings)
+        if not isinstance(merged.get('enabled', True), bool):
+            raise ValueError(f"{name}.enabled must be true or false")
+        if not isinstance(merged.get('min_confidence', 0), (int, float)):
+            raise ValueError(f"{name}.min_confidence must be a number")
+        timeframes = merged.get('timeframes', [merged.get('timeframe')])
+        if not timeframes or not set(timeframes) <= set(KNOWN_TIMEFRAMES):
+            raise ValueError(f"{name} timeframes must be drawn from {list(KNOWN_TIMEFRAMES)}")
+        config['strategies'][name] = merged
+    return config
+
+# Process-wide live configuration
+live_config = LiveConfig()
@@ -1,3 +1,5 @@
+import os
+
 # Trading settings
 TRADING_SETTINGS = {
     'timeframes': ['1m', '2m', '3m', '5m'],
@@ -10,7 +12,11 @@ TRADING_SETTINGS = {
     'max_concurrent_trades': 3,
     'risk_per_trade': 2.0,  # 2% of account per trade
     'stop_loss_pips': 20,
-    'take_profit_pips': 40
+    'take_profit_pips': 40,
+    'trade_amount': 10.0,  # Stake used to score signal outcomes
+    'payout_rate': 0.85,   # Broker payout on a winning trade
+    # Signal expiry per timeframe, in minutes
+    'expiry_minutes': {'1m': 2, '2m': 3, '3m': 4, '5m': 5}
 }
 
 # Strategy settings
@@ -26,3 +32,70 @@ STRATEGY_SETTINGS = {
         'min_confidence': 65
     }
 }
+
+# Dashboard settings
+DASHBOARD_SETTINGS = {
+    'emit_window_ms': 50,  # Coalesce broadcasts into one frame per window (0 = emit immediately)
+    'asset_check_interval': 2.0,  # Seconds between mtime checks of cached dashboard files
+    'chart_window': 200,  # Candles kept per (asset, timeframe) for chart snapshots
+    'signal_capacity': int(os.getenv('DASHBOARD_SIGNALS', '20')),  # Recent signals kept for /api/signals
+    'presence_interval': 1.0,  # Min seconds between 'clients_update' broadcasts
+    'bridge_interval': 0.005,  # Seconds between drains of work handed over by bot threads
+    'bridge_idle_interval': 0.05,  # Longest sleep between drains once idle (backs off from bridge_interval)
+    'bridge_batch': 200,       # Calls run per drain before yielding to requests
+    'bridge_max_pending': 10000  # Queued calls before new ones are dropped
+}
+
+# Signal journal settings
+JOURNAL_SETTINGS = {
+    'path': os.getenv('SIGNAL_JOURNAL_PATH', 'data/signals.db'),
+    'batch_size': 200,      # Max rows per write transaction
+    'flush_interval': 0.5,  # Seconds a batch may wait to fill up
+    'max_queue': 10000,     # Pending rows before new signals are dropped
+    'readers': 4            # Idle read-only connections kept for history queries
+}
+
+# Signal bus between one bot producer and any number of dashboard workers
+BUS_SETTINGS = {
+    'mode': os.getenv('BOT_MODE', 'embedded'),  # embedded | producer | consumer
+    'socket_path': os.getenv('BOT_BUS_PATH', '/tmp/quotex_bot.sock'),
+    'max_pending': 1000,  # Queued events per worker before it starts losing events
+    'replay': 500,        # Recent signals/outcomes replayed to a newly attached worker
+    'status_interval': 10.0  # Seconds between producer status (metrics) reports
+}
+
+# End-to-end latency tracing
+TRACING_SETTINGS = {
+    'sample_rate': float(os.getenv('TRACE_SAMPLE_RATE', '0.01')),  # Fraction of messages traced
+    'ring_size': 1000,      # Finished traces kept in memory
+    'offset_window': 300.0  # Seconds of ticks used to estimate the broker clock offset
+}
+
+# Startup and readiness (/ready) settings
+READINESS_SETTINGS = {
+    'bot_start_delay': float(os.getenv('BOT_START_DELAY', '1.0')),  # Seconds after boot before the bot connects
+    'auth_timeout': 15,  # Seconds to wait for the broker to accept the session
+    'warm_fraction': float(os.getenv('READY_WARM_FRACTION', '1.0'))  # Share of assets that must be warm
+}
+
+# Live trading configuration (assets, timeframes, strategies) reloaded without a restart
+LIVE_CONFIG_SETTINGS = {
+    'path': os.getenv('BOT_CONFIG_PATH', 'data/trading_config.json'),
+    'poll_interval': 2.0  # Seconds between checks of the config file
+}
+
+# Sharded ingestion: split the assets over several broker connections, one worker process each
+SHARD_SETTINGS = {
+    'shards': int(os.getenv('BOT_SHARDS', '1')),  # 1 = single connection in the bot's own process
+    'vnodes': 100,          # Points per shard on the consistent hash ring
+    'max_queue': 10000,     # Pending results from the workers before they are dropped
+    'status_interval': 5.0  # Seconds between worker readiness reports
+}
+
+# On-demand sampling profiler (/admin/profile)
+PROFILER_SETTINGS = {
+    'interval': 0.005,      # Seconds between samples by default (200 Hz)
+    'min_interval': 0.001,  # Fastest sampling a request may ask for
+    'max_seconds': 60,      # Longest profile a request may ask for
+    'max_depth': 64         # Innermost frames kept per stack
+}
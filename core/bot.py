@@ -0,0 +1,145 @@
+import math
+import threading
+import time
+from core.websocket_client import QuotexWebSocketClient
+from core.data_processor import DataProcessor
+from core.strategy_engine import StrategyEngine
+from core.outcome_tracker import SignalOutcomeTracker
+from core.tracing import tracer
+from utils.logger import setup_logger
+from utils.startup import startup
+from config.settings import TRADING_SETTINGS, STRATEGY_SETTINGS, READINESS_SETTINGS
+
+logger = setup_logger('bot')
+
+class QuotexTradingBot:
+    """
+    One broker connection with its own processing pipeline.
+
+    New signals come out of handle_message(); resolved outcomes and chart
+    rows go to the on_outcome/on_chart callbacks. main.py runs one of these,
+    or several in worker processes when sharding (see core/sharding.py).
+    """
+    def __init__(self, on_outcome=None, on_chart=None):
+        self.ws_client = QuotexWebSocketClient()
+        self.data_processor = DataProcessor()
+        self.strategy_engine = StrategyEngine(self.data_processor)
+        self.outcome_tracker = SignalOutcomeTracker(on_outcome=on_outcome)
+        self.strategy_engine.chart_listener = on_chart
+        self.running = False
+        
+    def initialize(self):
+        """Initialize the trading bot"""
+        logger.info("Initializing Quotex Trading Bot...")
+        
+        # Load strategies (pandas/numpy) off the web worker's import path
+        self.strategy_engine.load_strategies()
+        
+        # Connect to WebSocket (synchronous now)
+        with startup.timed('connect'):
+            connected = self.ws_client.connect()
+        if not connected:
+            logger.error("Failed to connect to WebSocket")
+            return False
+            
+        # Wait for the authorization response, the auth handler subscribes to all assets
+        with startup.timed('authenticate'):
+            if not self.ws_client.wait_authenticated(READINESS_SETTINGS['auth_timeout']):
+                logger.warning("No authorization response yet, subscriptions start once it arrives")
+        
+        # Start keep-alive in background thread
+        self.keep_alive_thread = threading.Thread(target=self.ws_client.keep_alive, daemon=True)
+        self.keep_alive_thread.start()
+        
+        self.running = True
+        logger.info("Trading bot initialized successfully")
+        return True
+    
+    def run(self):
+        """Main trading bot loop"""
+        try:
+            logger.info("Bot started. Waiting for messages...")
+            
+            # The new WebSocket client handles messages via callbacks
+            # We just need to keep the main thread alive
+            while self.running:
+                time.sleep(1)
+                
+                # Check if still connected
+                if not self.ws_client.connected:
+                    logger.warning("WebSocket disconnected. Attempting reconnect...")
+                    self.initialize()  # Reinitialize
+                    
+        except Exception as e:
+            logger.error(f"Error in main loop: {e}")
+        finally:
+            self.running = False
+            self.ws_client.disconnect()
+    
+    def handle_message(self, message, received=None):
+        """
+        Run one raw message through processing, outcome tracking and the
+        strategies. Returns a new signal (already registered for outcome
+        tracking) or None.
+        """
+        received = received or time.time()
+        processed_data = self.data_processor.process_message(message)
+        if not processed_data:
+            return None
+        trace = tracer.start(processed_data, received)
+        if trace:
+            trace.mark('process_message')
+            processed_data['trace'] = trace
+        # Resolve expiring signals before new ones are registered
+        self.outcome_tracker.observe(processed_data)
+        signal = self.strategy_engine.process_data(processed_data)
+        if not signal or signal.get('signal') == 'hold':
+            if trace:
+                tracer.finish(trace, 'no_signal')
+            return None
+        self.outcome_tracker.register(signal)
+        return signal
+    
+    def apply_settings(self, old=None, new=None):
+        """Apply a live config change: only changed strategies and subscriptions are touched"""
+        start = time.perf_counter()
+        pairs = {(asset, tf) for asset in TRADING_SETTINGS['assets'] for tf in TRADING_SETTINGS['timeframes']}
+        added_strategies, removed_strategies = self.strategy_engine.configure(STRATEGY_SETTINGS)
+        self.strategy_engine.set_active(pairs)
+        added, removed = self.ws_client.update_subscriptions(pairs)
+        logger.info(
+            f"Settings applied in {(time.perf_counter() - start) * 1000:.1f}ms: "
+            f"strategies +{sorted(added_strategies)} -{sorted(removed_strategies)}, "
+            f"subscriptions +{len(added)} -{len(removed)}"
+        )
+    
+    def readiness(self):
+        """Connection, subscription and per-asset indicator warm-up state for /ready"""
+        assets = TRADING_SETTINGS['assets']
+        timeframes = TRADING_SETTINGS['timeframes']
+        warm = {
+            asset: all(self.strategy_engine.is_warm(asset, tf) for tf in timeframes)
+            for asset in assets
+        }
+        subscribed = len(self.ws_client.subscribed)
+        expected = len(assets) * len(timeframes)
+        warm_needed = math.ceil(READINESS_SETTINGS['warm_fraction'] * len(assets))
+        ready = (self.ws_client.connected and self.ws_client.authenticated
+                 and subscribed >= expected and sum(warm.values()) >= warm_needed)
+        if ready and startup.mark_ready():
+            logger.info(f"Bot ready {startup.snapshot()['ready_after']}s after start")
+        return {
+            'ready': ready,
+            'connected': self.ws_client.connected,
+            'authenticated': self.ws_client.authenticated,
+            'subscribed': subscribed,
+            'subscriptions_expected': expected,
+            'warm': warm,
+            'startup': startup.snapshot()
+        }
+    
+    def shutdown(self):
+        """Graceful shutdown"""
+        logger.info("Shutting down trading bot...")
+        self.running = False
+        self.ws_client.disconnect()
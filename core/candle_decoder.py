@@ -0,0 +1,135 @@
+import itertools
+import json
+from utils.startup import startup
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Column order of one broker candle row
+COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+CANDLES_KEY = '"candles"'
+_BRACKETS = str.maketrans('[]', '  ')
+
+def loads(text):
+    """json.loads, through orjson when it is installed"""
+    return orjson.loads(text) if orjson else json.loads(text)
+
+class _OrjsonModule:
+    """dumps/loads with the stdlib signatures, for socketio.Client(json=...)"""
+    @staticmethod
+    def loads(text, *args, **kwargs):
+        return orjson.loads(text)
+
+    @staticmethod
+    def dumps(obj, *args, **kwargs):
+        return orjson.dumps(obj).decode('utf-8')
+
+def json_module():
+    """The JSON module the Socket.IO client should decode packets with"""
+    return _OrjsonModule if orjson else json
+
+class CandleColumns:
+    """
+    The candles of one update as contiguous column arrays: int64 timestamps
+    and float64 open/high/low/close/volume. Indexing a single row
+    (candles[-1]) still gives [timestamp, open, high, low, close, volume],
+    like the broker's lists.
+    """
+    __slots__ = COLUMNS
+
+    def __init__(self, timestamp, open, high, low, close, volume):
+        self.timestamp = timestamp
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    def __len__(self):
+        return len(self.timestamp)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return CandleColumns(*(getattr(self, name)[index] for name in COLUMNS))
+        return [int(self.timestamp[index])] + [float(getattr(self, name)[index]) for name in COLUMNS[1:]]
+
+    def tolist(self):
+        return [self[i] for i in range(len(self))]
+
+def from_rows(rows):
+    """CandleColumns from decoded [timestamp, open, high, low, close(, volume)] rows, None for any other shape"""
+    np = startup.lazy_import('numpy')
+    if not rows:
+        return _empty(np)
+    try:
+        widths = set(map(len, rows))
+        width = widths.pop()
+        if widths or not 5 <= width <= len(COLUMNS):
+            return None
+        # Streams the values into one buffer, about twice as fast as np.array() on nested lists
+        values = np.fromiter(itertools.chain.from_iterable(rows), dtype=np.float64, count=len(rows) * width)
+    except (TypeError, ValueError):
+        return None
+    return _columns(np, values.reshape(-1, width))
+
+def decode_frame(message):
+    """
+    Decode a Socket.IO event frame ('42["event", {...}]' or '["event", {...}]')
+    into [event, data]. Without orjson, the candle list of an instrument
+    update is parsed straight into CandleColumns by numpy rather than as a
+    Python list per candle; orjson builds the lists faster than that.
+    Returns None for frames that are not events; raises ValueError for bad JSON.
+    """
+    start = message.find('[')
+    if start < 0 or (start and not message[:start].isdigit()):
+        return None
+    if orjson is None and CANDLES_KEY in message:
+        decoded = _decode_with_candles(message, start)
+        if decoded is not None:
+            return decoded
+    decoded = loads(message[start:])
+    if not isinstance(decoded, list):
+        return None
+    return decoded
+
+def _decode_with_candles(message, start):
+    """Fast path for the instrument update schema, None when the frame doesn't fit it"""
+    np = startup.lazy_import('numpy')
+    key = message.index(CANDLES_KEY)
+    block_start = message.find('[', key + len(CANDLES_KEY))
+    if block_start < 0 or message[key + len(CANDLES_KEY):block_start].strip() != ':':
+        return None
+    if message[block_start + 1:].lstrip().startswith(']'):
+        return None  # Empty list, nothing to speed up
+    block_end = message.find(']]', block_start)
+    if block_end < 0:
+        return None
+    block_end += 2
+    block = message[block_start:block_end]
+    width = block[:block.index(']')].count(',') + 1
+    rows = block.count('[') - 1
+    if not 5 <= width <= len(COLUMNS):
+        return None
+    try:
+        values = np.fromstring(block.translate(_BRACKETS), dtype=np.float64, sep=',')
+    except ValueError:
+        return None
+    # Anything but numbers (null, strings, nested lists) stops the parse short
+    if len(values) != rows * width:
+        return None
+    decoded = loads(message[start:block_start] + '[]' + message[block_end:])
+    if not isinstance(decoded, list) or len(decoded) < 2 or not isinstance(decoded[1], dict) \
+            or decoded[1].get('candles') != []:
+        return None  # The candle list wasn't a top-level field of the payload
+    decoded[1]['candles'] = _columns(np, values.reshape(-1, width))
+    return decoded
+
+def _columns(np, values):
+    columns = np.ascontiguousarray(values.T)
+    volume = columns[5] if len(columns) > 5 else np.zeros(len(values))
+    return CandleColumns(columns[0].astype(np.int64), columns[1], columns[2], columns[3], columns[4], volume)
+
+def _empty(np):
+    return CandleColumns(np.empty(0, dtype=np.int64), *(np.empty(0) for _ in COLUMNS[1:]))
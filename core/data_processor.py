@@ -1,5 +1,7 @@
-import json
 import logging
+import time
+from core import candle_decoder
+from core.metrics import metrics
 from utils.logger import setup_logger
 
 logger = setup_logger('data_processor')
@@ -10,40 +12,50 @@ class DataProcessor:
         
     def process_message(self, message):
         """
-        Process raw WebSocket messages
+        Process WebSocket messages: an (event, data) pair already decoded by
+        the Socket.IO client, or a raw '42[...]' / '[...]' frame
         Returns: Processed data or None if not relevant
         """
+        start = time.perf_counter()
+        result = self._process_message(message)
+        metrics.observe('process_message', time.perf_counter() - start,
+                        asset=result.get('asset') if result else None)
+        return result
+    
+    def _process_message(self, message):
         try:
-            if isinstance(message, bytes):
-                message = message.decode('utf-8')
-            
-            # Log the message for debugging
-            logger.debug(f"Processing message: {message[:100]}...")
+            if isinstance(message, (list, tuple)):
+                json_data = message
+            else:
+                if isinstance(message, bytes):
+                    message = message.decode('utf-8')
+                
+                # Log the message for debugging, formatted only when DEBUG is enabled
+                logger.debug("Processing message: %.100s...", message)
+                
+                try:
+                    json_data = candle_decoder.decode_frame(message)
+                except ValueError:
+                    logger.warning("Failed to parse JSON message: %.200s", message)
+                    return None
             
             # Handle different message types
-            if message.startswith('42['):
-                # This is a data message
-                try:
-                    json_data = json.loads(message[2:])
-                    if isinstance(json_data, list) and len(json_data) > 0:
-                        message_type = json_data[0]
-                        
-                        if message_type == "tick":
-                            tick_data = json_data[1] if len(json_data) > 1 else {}
-                            return self._process_tick_data(tick_data)
-                            
-                        elif message_type == "instruments/update":
-                            update_data = json_data[1] if len(json_data) > 1 else {}
-                            return self._process_instrument_update(update_data)
+            if json_data and len(json_data) > 0:
+                message_type = json_data[0]
                 
-                except json.JSONDecodeError:
-                    logger.warning(f"Failed to parse JSON message: {message}")
-                    return None
+                if message_type == "tick":
+                    tick_data = json_data[1] if len(json_data) > 1 else {}
+                    return self._process_tick_data(tick_data)
+                    
+                elif message_type == "instruments/update":
+                    update_data = json_data[1] if len(json_data) > 1 else {}
+                    return self._process_instrument_update(update_data)
             
             return None
             
         except Exception as e:
             logger.error(f"Error processing message: {e}")
+            metrics.error('process_message')
             return None
     
     def _process_tick_data(self, tick_data):
@@ -61,11 +73,15 @@ class DataProcessor:
     def _process_instrument_update(self, update_data):
         """Process instrument update messages"""
         if isinstance(update_data, dict) and 'asset' in update_data:
+            candles = update_data.get('candles', [])
+            if not isinstance(candles, candle_decoder.CandleColumns):
+                # Rows from the Socket.IO client's decoder, kept as lists if they don't fit the schema
+                candles = candle_decoder.from_rows(candles) or candles
             return {
                 'type': 'instrument_update',
                 'asset': update_data['asset'],
                 'period': update_data.get('period'),
-                'candles': update_data.get('candles', []),
+                'candles': candles,
                 'raw_data': update_data
             }
         return None
@@ -0,0 +1,103 @@
+import bisect
+import time
+
+# Histogram bucket upper bounds in seconds: 50us growing by 1.5x up to ~20s
+BUCKETS = tuple(0.00005 * 1.5 ** i for i in range(33))
+QUANTILES = (0.5, 0.95, 0.99)
+LABELS = ('asset', 'timeframe', 'strategy')
+
+class Histogram:
+    """Fixed-bucket latency histogram, observe() is a bisect and two adds"""
+    __slots__ = ('counts', 'count', 'total')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+def quantile(counts, count, q):
+    """Estimate quantile q by interpolating inside the bucket that holds it"""
+    if not count:
+        return 0.0
+    rank = q * count
+    seen = 0
+    for i, bucket_count in enumerate(counts):
+        if bucket_count and seen + bucket_count >= rank:
+            if i == len(BUCKETS):
+                return float('inf')
+            lower = BUCKETS[i - 1] if i else 0.0
+            return lower + (BUCKETS[i] - lower) * (rank - seen) / bucket_count
+        seen += bucket_count
+    return float('inf')
+
+class MetricsRegistry:
+    """
+    Per-stage latency histograms and error counters keyed by
+    (stage, asset, timeframe, strategy).
+
+    Recording is lock-free: observations come almost entirely from the bot
+    thread, and an occasional lost increment under contention is acceptable
+    for monitoring data.
+    """
+    def __init__(self):
+        self.started = time.time()
+        self._histograms = {}
+        self._errors = {}
+
+    def observe(self, stage, seconds, asset=None, timeframe=None, strategy=None):
+        key = (stage, asset, timeframe, strategy)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram()
+        histogram.observe(seconds)
+
+    def error(self, stage, asset=None, timeframe=None, strategy=None):
+        key = (stage, asset, timeframe, strategy)
+        self._errors[key] = self._errors.get(key, 0) + 1
+
+    def snapshot(self):
+        """Plain-data copy of every series, safe to serialize or ship to another process"""
+        return {
+            'started': self.started,
+            'histograms': [
+                {'key': list(key), 'counts': list(h.counts), 'count': h.count, 'total': h.total}
+                for key, h in list(self._histograms.items())
+            ],
+            'errors': [{'key': list(key), 'count': count} for key, count in list(self._errors.items())]
+        }
+
+def render(snapshot, extra_labels=None, now=None):
+    """Text exposition of a snapshot: p50/p95/p99, mean, count, throughput and errors"""
+    now = now or time.time()
+    uptime = max(now - snapshot['started'], 1e-9)
+    lines = []
+
+    for series in sorted(snapshot['histograms'], key=lambda s: [str(k) for k in s['key']]):
+        labels = _labels(series['key'], extra_labels)
+        count = series['count']
+        for q in QUANTILES:
+            value = quantile(series['counts'], count, q)
+            lines.append(f'stage_latency_seconds{{{labels},quantile="{q}"}} {value:.6f}')
+        mean = series['total'] / count if count else 0.0
+        lines.append(f'stage_latency_seconds_mean{{{labels}}} {mean:.6f}')
+        lines.append(f'stage_calls_total{{{labels}}} {count}')
+        lines.append(f'stage_throughput_per_second{{{labels}}} {count / uptime:.3f}')
+
+    for series in sorted(snapshot['errors'], key=lambda s: [str(k) for k in s['key']]):
+        lines.append(f'stage_errors_total{{{_labels(series["key"], extra_labels)}}} {series["count"]}')
+
+    return '\n'.join(lines) + '\n'
+
+def _labels(key, extra_labels=None):
+    parts = [f'stage="{key[0]}"']
+    parts += [f'{name}="{value}"' for name, value in zip(LABELS, key[1:]) if value is not None]
+    parts += [f'{name}="{value}"' for name, value in (extra_labels or {}).items()]
+    return ','.join(parts)
+
+# Process-wide registry used by the bot pipeline and the dashboard
+metrics = MetricsRegistry()
@@ -0,0 +1,117 @@
+import heapq
+import itertools
+import threading
+from config.settings import TRADING_SETTINGS
+from utils.logger import setup_logger
+
+logger = setup_logger('outcome_tracker')
+
+class SignalOutcomeTracker:
+    """
+    Follows emitted signals until expiry and scores them against the live feed.
+
+    Pending signals are kept in one min-heap per asset keyed by expiry time, so
+    each price update only peeks at the earliest expiry for its own asset.
+    """
+    def __init__(self, on_outcome=None, trade_amount=None, payout_rate=None):
+        self.on_outcome = on_outcome
+        self.trade_amount = trade_amount if trade_amount is not None else TRADING_SETTINGS['trade_amount']
+        self.payout_rate = payout_rate if payout_rate is not None else TRADING_SETTINGS['payout_rate']
+        self._pending = {}  # {asset: [(expiry, seq, signal), ...]}
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def register(self, signal):
+        """Start tracking a signal that carries asset, entry_price and expiry"""
+        asset = signal.get('asset')
+        expiry = signal.get('expiry')
+        entry_price = signal.get('entry_price')
+        if not asset or expiry is None or entry_price is None:
+            logger.debug(f"Signal not trackable, missing expiry/price: {signal}")
+            return False
+
+        with self._lock:
+            heap = self._pending.setdefault(asset, [])
+            heapq.heappush(heap, (expiry, next(self._sequence), signal))
+        return True
+
+    def observe(self, processed_data):
+        """Feed a processed tick or candle update from DataProcessor"""
+        data_type = processed_data.get('type')
+        asset = processed_data.get('asset')
+
+        if data_type == 'tick':
+            timestamp = processed_data.get('timestamp')
+            price = processed_data.get('price')
+        elif data_type == 'instrument_update':
+            candles = processed_data.get('candles')
+            if not candles:
+                return
+            # The open of the newest candle is the price at its start time
+            timestamp, price = candles[-1][0], candles[-1][1]
+        else:
+            return
+
+        if timestamp is None or price is None:
+            return
+        self.on_price(asset, _to_seconds(timestamp), float(price))
+
+    def on_price(self, asset, timestamp, price):
+        """Resolve every pending signal for asset whose expiry is at or before timestamp"""
+        heap = self._pending.get(asset)
+        if not heap or heap[0][0] > timestamp:
+            return
+
+        expired = []
+        with self._lock:
+            while heap and heap[0][0] <= timestamp:
+                expired.append(heapq.heappop(heap)[2])
+
+        for signal in expired:
+            outcome = self._resolve(signal, price)
+            logger.info(f"Signal outcome: {outcome['asset']} {outcome['direction']} -> {outcome['result']}")
+            if self.on_outcome:
+                try:
+                    self.on_outcome(outcome)
+                except Exception as e:
+                    logger.error(f"Error publishing outcome: {e}")
+
+    def _resolve(self, signal, exit_price):
+        """Score a single signal against the price at expiry"""
+        direction = signal.get('signal')
+        entry_price = signal['entry_price']
+
+        if exit_price == entry_price:
+            result = 'draw'
+        elif (direction == 'buy') == (exit_price > entry_price):
+            result = 'win'
+        else:
+            result = 'loss'
+
+        if result == 'win':
+            profit = self.trade_amount * self.payout_rate
+        elif result == 'loss':
+            profit = -self.trade_amount
+        else:
+            profit = 0.0
+
+        return {
+            'asset': signal.get('asset'),
+            'timeframe': signal.get('timeframe'),
+            'strategy': signal.get('strategy'),
+            'direction': direction,
+            'entry_price': entry_price,
+            'exit_price': exit_price,
+            'expiry': signal.get('expiry'),
+            'result': result,
+            'profit': profit
+        }
+
+    def pending_count(self):
+        """Number of signals still waiting for expiry"""
+        return sum(len(heap) for heap in self._pending.values())
+
+def _to_seconds(timestamp):
+    """Normalise broker timestamps (seconds or milliseconds) to seconds"""
+    timestamp = float(timestamp)
+    return timestamp / 1000.0 if timestamp > 1e11 else timestamp
@@ -0,0 +1,22 @@
+def empty():
+    """Running performance totals before any signal"""
+    return {
+        'total_signals': 0,
+        'winning_signals': 0,
+        'losing_signals': 0,
+        'total_profit': 0
+    }
+
+def count_signal(performance):
+    """New totals with one more signal; the dict passed in is left untouched"""
+    return dict(performance, total_signals=performance['total_signals'] + 1)
+
+def count_outcome(performance, outcome):
+    """New totals with a resolved outcome applied; the dict passed in is left untouched"""
+    performance = dict(performance)
+    if outcome['result'] == 'win':
+        performance['winning_signals'] += 1
+    elif outcome['result'] == 'loss':
+        performance['losing_signals'] += 1
+    performance['total_profit'] += outcome['profit']
+    return performance
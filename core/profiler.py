@@ -0,0 +1,201 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from config.settings import PROFILER_SETTINGS
+from core.metrics import metrics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STRATEGIES_DIR = os.path.join(ROOT, 'strategies') + os.sep
+
+# Leaf frames in these files are threads parked on a lock, queue, socket or the eventlet hub
+IDLE_FILES = ('threading.py', 'queue.py', 'selectors.py', 'socket.py', 'ssl.py')
+IDLE_DIRS = (os.sep + 'hubs' + os.sep,)
+
+def _native():
+    """The real threading and time modules, even when eventlet has monkey patched them"""
+    try:
+        from eventlet import patcher
+        return patcher.original('threading'), patcher.original('time')
+    except ImportError:
+        return threading, time
+
+class SamplingProfiler:
+    """
+    On-demand wall-clock sampling profiler for the running process.
+
+    A native (never green) thread reads sys._current_frames() every
+    `interval` seconds and counts each thread's stack; nothing is hooked into
+    the code being profiled, so the cost is one stack walk per thread per
+    sample and stops when the run ends. Under eventlet all green threads
+    share the main OS thread, so its samples show whichever green thread
+    (bot, Socket.IO handler, emitter) was running at that moment.
+
+    Only one profile runs at a time, and runs are capped at max_seconds.
+    """
+    def __init__(self, interval=None, max_seconds=None, max_depth=None):
+        self.interval = interval or PROFILER_SETTINGS['interval']
+        self.max_seconds = max_seconds or PROFILER_SETTINGS['max_seconds']
+        self.max_depth = max_depth or PROFILER_SETTINGS['max_depth']
+        self._lock = threading.Lock()
+        self._labels = {}  # {code object: 'function (file)'}
+
+    @property
+    def running(self):
+        return self._lock.locked()
+
+    def profile(self, seconds, interval=None, include_idle=False):
+        """
+        Sample for `seconds` and return the report. Raises ValueError for bad
+        arguments and RuntimeError when another profile is already running.
+        """
+        interval = interval or self.interval
+        if not 0 < seconds <= self.max_seconds:
+            raise ValueError(f"seconds must be in (0, {self.max_seconds}]")
+        if not PROFILER_SETTINGS['min_interval'] <= interval <= 1.0:
+            raise ValueError(f"interval must be in [{PROFILER_SETTINGS['min_interval']}, 1.0]")
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("A profile is already running")
+
+        try:
+            native_threading, native_time = _native()
+            result = {}
+            before = _analyze_totals(metrics.snapshot())
+            sampler = native_threading.Thread(
+                target=self._sample, name='profiler', daemon=True,
+                args=(seconds, interval, include_idle, native_threading, native_time, result)
+            )
+            sampler.start()
+            # Polls with the (possibly green) time.sleep so the bot keeps running while we wait
+            while sampler.is_alive():
+                time.sleep(min(interval * 10, 0.1))
+            after = _analyze_totals(metrics.snapshot())
+            return self._report(result, seconds, interval, before, after)
+        finally:
+            self._lock.release()
+
+    def _sample(self, seconds, interval, include_idle, native_threading, native_time, result):
+        stacks = Counter()
+        strategy_samples = Counter()
+        own = native_threading.get_ident()
+        samples = 0
+        overhead = 0.0
+        start = native_time.perf_counter()
+        deadline = start + seconds
+        next_sample = start
+        while True:
+            now = native_time.perf_counter()
+            if now >= deadline:
+                break
+            if now < next_sample:
+                native_time.sleep(next_sample - now)
+                continue
+            next_sample += interval
+            if next_sample < now:
+                next_sample = now + interval  # Fell behind, don't burst to catch up
+            names = {t.ident: t.name for t in native_threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                if not include_idle and _is_idle(frame):
+                    continue
+                stack, strategy = self._walk(frame)
+                stacks[(names.get(ident, f'thread-{ident}'),) + stack] += 1
+                if strategy:
+                    strategy_samples[strategy] += 1
+            samples += 1
+            overhead += native_time.perf_counter() - now
+        result.update(stacks=stacks, strategy_samples=strategy_samples, samples=samples,
+                      elapsed=native_time.perf_counter() - start, overhead=overhead)
+
+    def _walk(self, frame):
+        """Root-first labels of a stack, and the outermost strategy module on it"""
+        labels = []
+        strategy = None
+        while frame is not None and len(labels) < self.max_depth:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = f"{code.co_name} ({_short_path(code.co_filename)})"
+            labels.append(label)
+            if code.co_filename.startswith(STRATEGIES_DIR):
+                strategy = os.path.splitext(os.path.basename(code.co_filename))[0]
+            frame = frame.f_back
+        labels.reverse()
+        return tuple(labels), strategy
+
+    def _report(self, result, seconds, interval, before, after):
+        stacks = result['stacks']
+        samples = result['samples']
+        self_counts = Counter()
+        total_counts = Counter()
+        for stack, count in stacks.items():
+            self_counts[stack[-1]] += count
+            for label in set(stack[1:]):
+                total_counts[label] += count
+
+        strategies = {}
+        for name in set(result['strategy_samples']) | set(after):
+            calls, spent = after.get(name, (0, 0.0))
+            prev_calls, prev_spent = before.get(name, (0, 0.0))
+            sampled = result['strategy_samples'].get(name, 0)
+            if not sampled and calls == prev_calls:
+                continue
+            strategies[name] = {
+                'samples': sampled,
+                'sampled_seconds': round(sampled * interval, 3),
+                'analyze_calls': calls - prev_calls,
+                'analyze_seconds': round(spent - prev_spent, 4)
+            }
+
+        return {
+            'seconds': seconds,
+            'interval': interval,
+            'samples': samples,
+            'elapsed': round(result['elapsed'], 3),
+            'overhead_seconds': round(result['overhead'], 4),
+            'strategies': strategies,
+            'top_self': _top(self_counts, samples, interval),
+            'top_total': _top(total_counts, samples, interval),
+            'collapsed': collapsed(stacks)
+        }
+
+def collapsed(stacks):
+    """Brendan Gregg's folded format, one 'frame;frame;frame count' line per stack"""
+    return [
+        ';'.join(label.replace(';', ':') for label in stack) + f' {count}'
+        for stack, count in stacks.most_common()
+    ]
+
+def _top(counts, samples, interval, limit=30):
+    return [
+        {'function': label, 'samples': count, 'seconds': round(count * interval, 3),
+         'share': round(count / samples, 3) if samples else 0.0}
+        for label, count in counts.most_common(limit)
+    ]
+
+def _analyze_totals(snapshot):
+    """{strategy: (calls, seconds)} of the 'analyze' stage, summed over assets and timeframes"""
+    totals = {}
+    for series in snapshot['histograms']:
+        stage, _, _, strategy = series['key']
+        if stage == 'analyze' and strategy:
+            calls, spent = totals.get(strategy, (0, 0.0))
+            totals[strategy] = (calls + series['count'], spent + series['total'])
+    return totals
+
+def _is_idle(frame):
+    filename = frame.f_code.co_filename
+    return filename.endswith(IDLE_FILES) or any(part in filename for part in IDLE_DIRS)
+
+def _short_path(filename):
+    if filename.startswith(ROOT + os.sep):
+        return os.path.relpath(filename, ROOT)
+    marker = os.sep + 'site-packages' + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    return os.path.basename(filename)
+
+# Process-wide profiler behind /admin/profile
+profiler = SamplingProfiler()
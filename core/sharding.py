@@ -0,0 +1,280 @@
+import bisect
+import hashlib
+import multiprocessing
+import queue
+import signal
+import threading
+import time
+from config.settings import TRADING_SETTINGS, STRATEGY_SETTINGS, SHARD_SETTINGS
+from utils.logger import setup_logger
+
+logger = setup_logger('sharding')
+
+class ConsistentHashRing:
+    """
+    Maps keys (asset names) to nodes (shard ids) on a hash ring.
+
+    Each node is placed at `vnodes` points so keys spread evenly; adding or
+    removing a node only moves the keys between it and its neighbours, about
+    1/N of them, instead of reshuffling everything.
+    """
+    def __init__(self, nodes=(), vnodes=100):
+        self.vnodes = vnodes
+        self._ring = []    # sorted (hash, node)
+        self._hashes = []  # hashes of _ring, for bisect
+        for node in nodes:
+            self.add_node(node)
+
+    @property
+    def nodes(self):
+        return sorted({node for _, node in self._ring})
+
+    def add_node(self, node):
+        for i in range(self.vnodes):
+            bisect.insort(self._ring, (_hash(f"{node}#{i}"), node))
+        self._hashes = [h for h, _ in self._ring]
+
+    def remove_node(self, node):
+        self._ring = [(h, n) for h, n in self._ring if n != node]
+        self._hashes = [h for h, _ in self._ring]
+
+    def node_for(self, key):
+        if not self._ring:
+            raise ValueError("Hash ring has no nodes")
+        index = bisect.bisect(self._hashes, _hash(key)) % len(self._ring)
+        return self._ring[index][1]
+
+    def assign(self, keys):
+        """{node: [keys]} for every node, in key order"""
+        assignment = {node: [] for node in self.nodes}
+        for key in keys:
+            assignment[self.node_for(key)].append(key)
+        return assignment
+
+def _hash(value):
+    return int.from_bytes(hashlib.md5(value.encode('utf-8')).digest()[:8], 'big')
+
+class ShardCoordinator:
+    """
+    Splits the asset list across worker processes, each with its own broker
+    connection, DataProcessor and StrategyEngine (a QuotexTradingBot).
+
+    Assets are assigned with a ConsistentHashRing. Workers put new signals,
+    outcomes, chart rows and periodic status on one results queue; a merge
+    thread drains it into the on_signal/on_outcome/on_chart callbacks, so the
+    rest of the app sees a single stream. Offers the same initialize/run/
+    apply_settings/readiness/shutdown interface as QuotexTradingBot.
+    """
+    def __init__(self, shards, on_signal, on_outcome=None, on_chart=None, vnodes=None,
+                 max_queue=None, status_interval=None):
+        self.ring = ConsistentHashRing(range(shards), vnodes or SHARD_SETTINGS['vnodes'])
+        self.on_signal = on_signal
+        self.on_outcome = on_outcome
+        self.on_chart = on_chart
+        self.status_interval = status_interval or SHARD_SETTINGS['status_interval']
+        self._ctx = multiprocessing.get_context('spawn')
+        self.results = self._ctx.Queue(maxsize=max_queue or SHARD_SETTINGS['max_queue'])
+        self._workers = {}     # {shard_id: (process, command queue)}
+        self._assignment = {}  # {shard_id: [assets]}
+        self._status = {}      # {shard_id: latest status report}
+        self._lock = threading.Lock()
+        self.running = False
+
+    def initialize(self):
+        """Start one worker per shard and the merge thread"""
+        with self._lock:
+            self._assignment = self.ring.assign(TRADING_SETTINGS['assets'])
+            for shard_id, assets in self._assignment.items():
+                self._spawn(shard_id, assets)
+        threading.Thread(target=self._merge_loop, name='shard-merge', daemon=True).start()
+        self.running = True
+        logger.info(f"Started {len(self._assignment)} shards: "
+                    f"{ {shard_id: len(assets) for shard_id, assets in self._assignment.items()} } assets each")
+        return True
+
+    def run(self):
+        """Restart workers that died until shutdown"""
+        while self.running:
+            time.sleep(self.status_interval)
+            with self._lock:
+                for shard_id, (process, _) in list(self._workers.items()):
+                    if self.running and not process.is_alive():
+                        logger.warning(f"Shard {shard_id} exited ({process.exitcode}), restarting")
+                        self._spawn(shard_id, self._assignment.get(shard_id, []))
+
+    def apply_settings(self, old=None, new=None):
+        """Live config change: reassign assets and let each worker apply its own diff"""
+        self._rebalance()
+
+    def add_shard(self):
+        """Add a worker; only the assets the ring hands to it move"""
+        with self._lock:
+            shard_id = max(self.ring.nodes, default=-1) + 1
+            self.ring.add_node(shard_id)
+        self._rebalance()
+        return shard_id
+
+    def remove_shard(self, shard_id):
+        """Stop a worker and hand its assets to the neighbouring shards"""
+        with self._lock:
+            self.ring.remove_node(shard_id)
+            worker = self._workers.pop(shard_id, None)
+            self._assignment.pop(shard_id, None)
+            self._status.pop(shard_id, None)
+        if worker:
+            worker[1].put(('stop', None))
+        self._rebalance()
+
+    def readiness(self):
+        """Ready when every shard is ready; subscriptions and warm-up merged across shards"""
+        with self._lock:
+            reports = {shard_id: self._status.get(shard_id, {}).get('readiness') or {} for shard_id in self._workers}
+            shards = {
+                shard_id: {
+                    'assets': len(self._assignment.get(shard_id, [])),
+                    'ready': reports[shard_id].get('ready', False),
+                    'pid': process.pid
+                }
+                for shard_id, (process, _) in self._workers.items()
+            }
+        warm = {}
+        for report in reports.values():
+            warm.update(report.get('warm', {}))
+        return {
+            'ready': bool(reports) and all(r.get('ready') for r in reports.values()),
+            'connected': bool(reports) and all(r.get('connected') for r in reports.values()),
+            'authenticated': bool(reports) and all(r.get('authenticated') for r in reports.values()),
+            'subscribed': sum(r.get('subscribed', 0) for r in reports.values()),
+            'subscriptions_expected': len(TRADING_SETTINGS['assets']) * len(TRADING_SETTINGS['timeframes']),
+            'warm': warm,
+            'shards': shards
+        }
+
+    def shutdown(self):
+        logger.info("Stopping shard workers...")
+        self.running = False
+        with self._lock:
+            workers = list(self._workers.values())
+            self._workers.clear()
+        for process, commands in workers:
+            commands.put(('stop', None))
+        for process, _ in workers:
+            process.join(5)
+            if process.is_alive():
+                process.terminate()
+
+    def _rebalance(self):
+        with self._lock:
+            assignment = self.ring.assign(TRADING_SETTINGS['assets'])
+            previous = {asset: shard_id for shard_id, assets in self._assignment.items() for asset in assets}
+            moved = sum(1 for shard_id, assets in assignment.items()
+                        for asset in assets if previous.get(asset, shard_id) != shard_id)
+            self._assignment = assignment
+            for shard_id, assets in assignment.items():
+                if shard_id not in self._workers:
+                    if self.running:
+                        self._spawn(shard_id, assets)
+                    continue
+                # Workers diff this against their own subscriptions, unchanged shards send nothing
+                self._workers[shard_id][1].put(('config', _shard_config(assets)))
+        logger.info(f"Rebalanced {len(TRADING_SETTINGS['assets'])} assets over {len(assignment)} shards, "
+                    f"{moved} moved")
+
+    def _spawn(self, shard_id, assets):
+        commands = self._ctx.Queue()
+        process = self._ctx.Process(
+            target=run_shard, name=f'shard-{shard_id}', daemon=True,
+            args=(shard_id, _shard_config(assets), self.results, commands, self.status_interval)
+        )
+        process.start()
+        self._workers[shard_id] = (process, commands)
+
+    def _merge_loop(self):
+        while True:
+            try:
+                shard_id, kind, payload = self.results.get()
+            except (EOFError, OSError):
+                return
+            try:
+                if kind == 'signal':
+                    self.on_signal(payload)
+                elif kind == 'outcome' and self.on_outcome:
+                    self.on_outcome(payload)
+                elif kind == 'chart' and self.on_chart:
+                    self.on_chart(*payload)
+                elif kind == 'status':
+                    with self._lock:
+                        self._status[shard_id] = payload
+            except Exception as e:
+                logger.error(f"Error merging {kind} from shard {shard_id}: {e}")
+
+def _shard_config(assets):
+    return {
+        'assets': list(assets),
+        'timeframes': list(TRADING_SETTINGS['timeframes']),
+        'strategies': dict(STRATEGY_SETTINGS)
+    }
+
+def _apply_shard_config(config):
+    """Point this worker process's settings at its share of the assets"""
+    TRADING_SETTINGS['assets'] = config['assets']
+    TRADING_SETTINGS['timeframes'] = config['timeframes']
+    STRATEGY_SETTINGS.clear()
+    STRATEGY_SETTINGS.update(config['strategies'])
+
+def run_shard(shard_id, config, results, commands, status_interval):
+    """Entry point of a shard worker process"""
+    from core.bot import QuotexTradingBot
+    from core.metrics import metrics
+
+    shard_logger = setup_logger(f'shard{shard_id}')
+
+    def send(kind, payload):
+        try:
+            results.put_nowait((shard_id, kind, payload))
+        except queue.Full:
+            metrics.error('shard_queue')
+
+    bot = QuotexTradingBot(
+        on_outcome=lambda outcome: send('outcome', outcome),
+        on_chart=lambda asset, timeframe, rows: send('chart', (asset, timeframe, rows))
+    )
+
+    def on_message(message):
+        try:
+            signal = bot.handle_message(message)
+            if signal:
+                send('signal', signal)
+        except Exception as e:
+            shard_logger.error(f"Error processing message: {e}")
+            metrics.error('pipeline')
+
+    def command_loop():
+        while True:
+            command, payload = commands.get()
+            if command == 'stop':
+                bot.shutdown()
+                return
+            if command == 'config':
+                _apply_shard_config(payload)
+                bot.apply_settings()
+
+    def status_loop():
+        while True:
+            time.sleep(status_interval)
+            send('status', {'readiness': bot.readiness()})
+
+    def handle_shutdown(signum, frame):
+        # SIGTERM from the coordinator's host or Ctrl-C in the terminal stops this shard's own bot
+        shard_logger.info(f"Shard {shard_id} received shutdown signal")
+        bot.shutdown()
+
+    signal.signal(signal.SIGTERM, handle_shutdown)
+    signal.signal(signal.SIGINT, handle_shutdown)
+    _apply_shard_config(config)
+    bot.ws_client.on_message_callback = on_message
+    threading.Thread(target=command_loop, name='shard-commands', daemon=True).start()
+    threading.Thread(target=status_loop, name='shard-status', daemon=True).start()
+    shard_logger.info(f"Shard {shard_id} following {len(config['assets'])} assets")
+    if bot.initialize():
+        bot.run()
@@ -0,0 +1,216 @@
+import json
+import os
+import queue
+import socket
+import threading
+import time
+from collections import deque
+from core import performance as perf
+from utils.logger import setup_logger
+
+logger = setup_logger('signal_bus')
+
+class BusPublisher:
+    """
+    Producer side of the local signal bus.
+
+    Listens on a Unix domain socket and fans every event out to all connected
+    dashboard workers as newline-delimited JSON. Each event is serialized once;
+    a slow worker only loses its own events once its queue is full. New
+    workers are replayed recent signals/outcomes and the current chart windows.
+
+    Signals and outcomes carry a sequence number, so a worker that reconnects
+    can skip the replayed ones it already applied, and the producer's
+    performance totals after that event, so workers never count them again.
+    The epoch (producer start time) tells workers the numbering restarted.
+
+    Exposes the same add_signal / record_outcome / publish_chart methods as
+    Dashboard so the bot can publish to either without knowing which.
+    """
+    def __init__(self, path, max_pending=1000, replay=500, chart_window=200,
+                 status_provider=None, status_interval=10.0):
+        self.path = path
+        self.status_provider = status_provider
+        self.status_interval = status_interval
+        self.max_pending = max_pending
+        self.chart_window = chart_window
+        self._subscribers = {}  # {connection: queue of encoded lines}
+        self._replay = deque(maxlen=replay)
+        self._charts = {}  # {(asset, timeframe): deque of rows}
+        self._lock = threading.Lock()
+        self._server = None
+        self.dropped = 0
+        self.epoch = int(time.time() * 1000)
+        self.seq = 0
+        self.performance = perf.empty()
+
+    def start(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(self.path)
+        self._server.listen(64)
+        threading.Thread(target=self._accept_loop, name='bus-accept', daemon=True).start()
+        if self.status_provider:
+            threading.Thread(target=self._status_loop, name='bus-status', daemon=True).start()
+        logger.info(f"Signal bus listening on {self.path}")
+        return self
+
+    def add_signal(self, signal):
+        trace = signal.get('trace')
+        if trace is not None:
+            # Traces continue in the dashboard worker that emits the signal
+            trace.mark('publish')
+            signal = dict(signal, trace=trace.to_dict())
+        self.publish('signal', signal)
+
+    def record_outcome(self, outcome):
+        self.publish('outcome', outcome)
+
+    def publish_chart(self, asset, timeframe, rows):
+        self.publish('chart', {'asset': asset, 'timeframe': timeframe, 'rows': rows})
+
+    def publish(self, event, data):
+        """Serialize once and queue the line for every subscriber"""
+        if event not in ('signal', 'outcome'):
+            line = encode(event, data)
+            with self._lock:
+                if event == 'chart':
+                    self._remember_chart(data)
+                self._fan_out(line)
+            return
+
+        with self._lock:
+            # Numbered and queued under the lock, so every worker sees the sequence in order
+            self.seq += 1
+            if event == 'signal':
+                self.performance = perf.count_signal(self.performance)
+            else:
+                self.performance = perf.count_outcome(self.performance, data)
+            line = encode(event, data, seq=self.seq, epoch=self.epoch, performance=self.performance)
+            self._replay.append(line)
+            self._fan_out(line)
+
+    def _fan_out(self, line):
+        for pending in self._subscribers.values():
+            try:
+                pending.put_nowait(line)
+            except queue.Full:
+                self.dropped += 1
+
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+    def _remember_chart(self, data):
+        key = (data['asset'], data['timeframe'])
+        candles = self._charts.get(key)
+        if candles is None:
+            candles = self._charts[key] = deque(maxlen=self.chart_window)
+        for row in data['rows']:
+            if candles and candles[-1]['time'] == row['time']:
+                candles[-1] = row
+            elif not candles or row['time'] > candles[-1]['time']:
+                candles.append(row)
+
+    def _status_loop(self):
+        """Periodically publish producer status (metrics etc.) for the dashboard workers"""
+        while True:
+            time.sleep(self.status_interval)
+            try:
+                self.publish('status', self.status_provider())
+            except Exception as e:
+                logger.error(f"Error publishing status: {e}")
+
+    def _accept_loop(self):
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            pending = queue.Queue(maxsize=self.max_pending)
+            with self._lock:
+                # Replay happens under the lock so no live event can slip in between
+                backlog = list(self._replay) + [
+                    encode('chart', {'asset': asset, 'timeframe': timeframe, 'rows': list(candles)})
+                    for (asset, timeframe), candles in self._charts.items()
+                ]
+                for line in backlog[-self.max_pending:]:
+                    pending.put_nowait(line)
+                self._subscribers[conn] = pending
+            threading.Thread(target=self._send_loop, args=(conn, pending), name='bus-send', daemon=True).start()
+            logger.info(f"Dashboard worker subscribed ({len(self._subscribers)} total)")
+
+    def _send_loop(self, conn, pending):
+        try:
+            while True:
+                conn.sendall(pending.get())
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                self._subscribers.pop(conn, None)
+            conn.close()
+            logger.info(f"Dashboard worker unsubscribed ({len(self._subscribers)} left)")
+
+class BusSubscriber:
+    """
+    Dashboard-worker side of the local signal bus.
+
+    Connects to the producer's socket (reconnecting as needed) and replays
+    every event into a sink with the Dashboard interface. Signals and
+    outcomes at or below the last applied sequence number are replays of
+    ones already applied before a reconnect and are dropped.
+    """
+    def __init__(self, path, sink, reconnect_delay=2.0):
+        self.path = path
+        self.sink = sink
+        self.reconnect_delay = reconnect_delay
+        self.connected = False
+        self.epoch = None
+        self.last_seq = 0
+
+    def start(self):
+        threading.Thread(target=self._run, name='bus-subscriber', daemon=True).start()
+        return self
+
+    def _run(self):
+        while True:
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+                    conn.connect(self.path)
+                    self.connected = True
+                    logger.info(f"Connected to signal bus at {self.path}")
+                    for line in conn.makefile('rb'):
+                        self._dispatch(line)
+            except OSError as e:
+                logger.debug(f"Signal bus unavailable: {e}")
+            self.connected = False
+            time.sleep(self.reconnect_delay)
+
+    def _dispatch(self, line):
+        try:
+            message = json.loads(line)
+            event, data = message['event'], message['data']
+            if 'seq' in message:
+                if message['epoch'] != self.epoch:
+                    # New producer process, its numbering starts over
+                    self.epoch, self.last_seq = message['epoch'], 0
+                if message['seq'] <= self.last_seq:
+                    return
+                self.last_seq = message['seq']
+            if event == 'signal':
+                self.sink.add_signal(data, performance=message['performance'],
+                                     seq=message['seq'], epoch=message['epoch'])
+            elif event == 'outcome':
+                self.sink.record_outcome(data, performance=message['performance'],
+                                         seq=message['seq'], epoch=message['epoch'])
+            elif event == 'chart':
+                self.sink.publish_chart(data['asset'], data['timeframe'], data['rows'])
+            elif event == 'status':
+                self.sink.update_status(data)
+        except Exception as e:
+            logger.error(f"Error handling bus message: {e}")
+
+def encode(event, data, **fields):
+    message = dict(fields, event=event, data=data)
+    return (json.dumps(message, separators=(',', ':'), default=str) + '\n').encode('utf-8')
@@ -0,0 +1,189 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from config.settings import JOURNAL_SETTINGS
+from utils.logger import setup_logger
+
+logger = setup_logger('signal_journal')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS signals (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    asset TEXT NOT NULL,
+    timeframe TEXT,
+    strategy TEXT,
+    direction TEXT,
+    confidence REAL,
+    type TEXT,
+    entry_price REAL,
+    expiry REAL,
+    payload TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_signals_asset_ts ON signals (asset, ts);
+CREATE INDEX IF NOT EXISTS idx_signals_strategy_ts ON signals (strategy, ts);
+CREATE INDEX IF NOT EXISTS idx_signals_ts ON signals (ts);
+"""
+
+COLUMNS = ('ts', 'asset', 'timeframe', 'strategy', 'direction', 'confidence',
+           'type', 'entry_price', 'expiry', 'payload')
+
+class SignalJournal:
+    """
+    Persistent signal history in SQLite (WAL mode).
+
+    append() only puts a row on an in-memory queue. A background writer
+    drains the queue and commits rows in batched transactions, so signal
+    emission never waits on disk. Queries borrow a read-only connection from
+    a small pool and are not blocked by the writer; the schema and PRAGMAs
+    are set up once, not per reader.
+    """
+    def __init__(self, path=None, batch_size=None, flush_interval=None, max_queue=None, readers=None):
+        self.path = path or JOURNAL_SETTINGS['path']
+        self.batch_size = batch_size or JOURNAL_SETTINGS['batch_size']
+        self.flush_interval = flush_interval or JOURNAL_SETTINGS['flush_interval']
+        self._queue = queue.Queue(maxsize=max_queue or JOURNAL_SETTINGS['max_queue'])
+        self._writer_thread = None
+        self._start_lock = threading.Lock()
+        self._schema_ready = False
+        self._readers = queue.LifoQueue(maxsize=readers or JOURNAL_SETTINGS['readers'])
+        self.dropped = 0
+
+    def append(self, signal):
+        """Queue a signal for persistence, never blocks"""
+        self._ensure_writer()
+        row = (
+            float(signal.get('candle_time') or time.time()),
+            signal.get('asset', 'Unknown'),
+            signal.get('timeframe'),
+            signal.get('strategy'),
+            signal.get('signal'),
+            signal.get('confidence'),
+            signal.get('type'),
+            signal.get('entry_price'),
+            signal.get('expiry'),
+            json.dumps({k: v for k, v in signal.items() if k != 'trace'}, default=str)
+        )
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(f"Signal journal queue full, dropped {self.dropped} signals so far")
+
+    def query(self, asset=None, strategy=None, timeframe=None, start=None, end=None, limit=500):
+        """Signals in [start, end) newest first, optionally filtered by asset/strategy/timeframe"""
+        clauses, params = [], []
+        for column, value in (('asset', asset), ('strategy', strategy), ('timeframe', timeframe)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if start is not None:
+            clauses.append("ts >= ?")
+            params.append(float(start))
+        if end is not None:
+            clauses.append("ts < ?")
+            params.append(float(end))
+
+        sql = "SELECT id, " + ", ".join(COLUMNS[:-1]) + " FROM signals"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY ts DESC LIMIT ?"
+        params.append(int(limit))
+
+        conn = self._borrow_reader()
+        try:
+            return [dict(row) for row in conn.execute(sql, params)]
+        finally:
+            self._return_reader(conn)
+
+    def close(self, timeout=5):
+        """Flush pending rows and stop the writer"""
+        if self._writer_thread and self._writer_thread.is_alive():
+            self._queue.put(None)
+            self._writer_thread.join(timeout)
+
+    def _ensure_writer(self):
+        if self._writer_thread is not None:
+            return
+        with self._start_lock:
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(target=self._write_loop, name='signal-journal', daemon=True)
+                self._writer_thread.start()
+
+    def _connect(self):
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        self._ensure_schema(conn)
+        return conn
+
+    def _ensure_schema(self, conn):
+        """WAL mode and tables, once per process (WAL mode is stored in the database file)"""
+        if self._schema_ready:
+            return
+        with self._start_lock:
+            if not self._schema_ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(SCHEMA)
+                self._schema_ready = True
+
+    def _borrow_reader(self):
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        if not self._schema_ready:
+            self._connect().close()
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, timeout=10, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _return_reader(self, conn):
+        try:
+            self._readers.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _write_loop(self):
+        try:
+            conn = self._connect()
+        except Exception as e:
+            logger.error(f"Cannot open signal journal at {self.path}: {e}")
+            return
+
+        insert = f"INSERT INTO signals ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+        stopping = False
+        while not stopping:
+            row = self._queue.get()
+            if row is None:
+                break
+            batch = [row]
+            # Let a burst accumulate, then take everything queued up to batch_size
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    row = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if row is None:
+                    stopping = True
+                    break
+                batch.append(row)
+
+            try:
+                with conn:
+                    conn.executemany(insert, batch)
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} signals to journal: {e}")
+        conn.close()
+
+# Shared journal, the writer thread starts on first append
+journal = SignalJournal()
@@ -1,10 +1,24 @@
-import pandas as pd
-from strategies.trend_reversal import TrendReversalStrategy
-from strategies.trend_following import TrendFollowingStrategy
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from config.settings import TRADING_SETTINGS, STRATEGY_SETTINGS
+from core.candle_decoder import CandleColumns, from_rows
+from core.metrics import metrics
 from utils.logger import setup_logger
+from utils.startup import startup
 
 logger = setup_logger('strategy_engine')
 
+# Candle and indicator columns streamed to dashboard charts
+CHART_FIELDS = ('open', 'high', 'low', 'close', 'jaw', 'teeth', 'lips', 'ema_150', 'stoch_k', 'stoch_d')
+
+# Strategy name in STRATEGY_SETTINGS -> (module, class)
+STRATEGY_CLASSES = {
+    'trend_reversal': ('strategies.trend_reversal', 'TrendReversalStrategy'),
+    'trend_following': ('strategies.trend_following', 'TrendFollowingStrategy')
+}
+
 class StrategyEngine:
     def __init__(self, data_processor):
         self.data_processor = data_processor
@@ -12,17 +26,79 @@ class StrategyEngine:
         self.signals = []
         self.max_signals_history = 100
         
-        # Initialize ALL strategies
-        self._initialize_strategies()
-    
-    def _initialize_strategies(self):
-        # Trend Reversal Strategy for 5m timeframe
-        self.strategies['trend_reversal_5m'] = TrendReversalStrategy(timeframe='5m')
+        # Optional callback(asset, timeframe, rows) receiving chart candles with indicators
+        self.chart_listener = None
+        self.chart_window = 200
+        self._chart_marks = {}  # {(asset, timeframe): timestamp of last published candle}
+        
+        # {(asset, timeframe): True once a strategy analyzed enough candles}
+        self.warm = {}
         
-        # Trend Following Strategies for shorter timeframes
-        self.strategies['trend_following_1m'] = TrendFollowingStrategy(timeframe='1m')
-        self.strategies['trend_following_2m'] = TrendFollowingStrategy(timeframe='2m')
-        self.strategies['trend_following_3m'] = TrendFollowingStrategy(timeframe='3m')
+        # Strategies (and pandas/numpy with them) are built from STRATEGY_SETTINGS on first use
+        self._by_timeframe = {}  # {'1m': 'trend_following_1m', ...}
+        self._min_confidence = {}  # {strategy key: min_confidence}
+        self._configured = False
+        self._strategies_lock = threading.Lock()
+        # (asset, timeframe) pairs to analyze, None accepts everything
+        self.active = None
+    
+    def load_strategies(self):
+        """Import and build the strategies once, safe to call from any thread"""
+        if self._configured:
+            return
+        with startup.timed('strategies'):
+            self.configure(STRATEGY_SETTINGS)
+    
+    def configure(self, strategy_settings):
+        """
+        Build strategies for the enabled entries of strategy_settings. Strategies
+        whose key is unchanged are kept as they are, returns (added, removed) keys.
+        """
+        with self._strategies_lock:
+            strategies, by_timeframe, min_confidence = {}, {}, {}
+            for name, settings in strategy_settings.items():
+                if not settings.get('enabled', True) or name not in STRATEGY_CLASSES:
+                    continue
+                for timeframe in settings.get('timeframes') or [settings.get('timeframe')]:
+                    if timeframe in by_timeframe:
+                        logger.warning(f"{name} ignored on {timeframe}, already handled by {by_timeframe[timeframe]}")
+                        continue
+                    key = f"{name}_{timeframe}"
+                    strategy = self.strategies.get(key)
+                    if strategy is None:
+                        module, class_name = STRATEGY_CLASSES[name]
+                        strategy = getattr(startup.lazy_import(module), class_name)(timeframe=timeframe)
+                    strategies[key] = strategy
+                    by_timeframe[timeframe] = key
+                    min_confidence[key] = settings.get('min_confidence', 0)
+            
+            added = set(strategies) - set(self.strategies)
+            removed = set(self.strategies) - set(strategies)
+            # Swap whole dicts so the message path never sees a half-built mapping
+            self.strategies = strategies
+            self._by_timeframe = by_timeframe
+            self._min_confidence = min_confidence
+            self._configured = True
+            for key in removed:
+                # Recomputed as soon as a strategy for this timeframe returns
+                timeframe = key.rsplit('_', 1)[1]
+                self._forget(lambda pair: pair[1] == timeframe)
+        return added, removed
+    
+    def set_active(self, pairs):
+        """Restrict analysis to these (asset, timeframe) pairs, dropping state for removed ones"""
+        pairs = frozenset(pairs)
+        self.active = pairs
+        self._forget(lambda pair: pair not in pairs)
+    
+    def _forget(self, predicate):
+        for state in (self.warm, self._chart_marks):
+            for pair in [p for p in state if predicate(p)]:
+                state.pop(pair, None)
+    
+    def is_warm(self, asset, timeframe):
+        """True once the strategy for asset/timeframe has had enough candles to signal"""
+        return self.warm.get((asset, timeframe), False)
     
     def process_data(self, processed_data):
         """
@@ -52,7 +128,7 @@ class StrategyEngine:
         asset = tick_data.get('asset', '')
         price = tick_data.get('price', 0)
         
-        logger.debug(f"Processing tick: {asset} = {price}")
+        logger.debug("Processing tick: %s = %s", asset, price)
         
         # For tick data, we might want to use different strategies
         # For now, return None as ticks are less reliable for our strategies
@@ -64,46 +140,125 @@ class StrategyEngine:
         candles = ohlc_data.get('candles', [])
         timeframe = ohlc_data.get('period', '5m')
         
-        logger.debug(f"Processing OHLC: {asset} with {len(candles)} candles (TF: {timeframe})")
+        logger.debug("Processing OHLC: %s with %d candles (TF: %s)", asset, len(candles), timeframe)
         
         # Convert candles to DataFrame for our strategies
         if candles and len(candles) > 0:
-            df = self._candles_to_dataframe(candles)
+            timeframe_name = self._seconds_to_timeframe(timeframe)
+            if self.active is not None and (asset, timeframe_name) not in self.active:
+                # Left over from a subscription that was just removed
+                return None
             
+            self.load_strategies()
             # Run appropriate strategy based on timeframe
-            if timeframe == 300 or timeframe == '5m':  # 5 minutes
-                signal = self.strategies['trend_reversal_5m'].analyze(df)
-            elif timeframe == 60 or timeframe == '1m':  # 1 minute
-                signal = self.strategies['trend_following_1m'].analyze(df)
-            elif timeframe == 120 or timeframe == '2m':  # 2 minutes
-                signal = self.strategies['trend_following_2m'].analyze(df)
-            elif timeframe == 180 or timeframe == '3m':  # 3 minutes
-                signal = self.strategies['trend_following_3m'].analyze(df)
+            strategy_key = self._by_timeframe.get(timeframe_name)
+            strategy = self.strategies.get(strategy_key) if strategy_key else None
+            
+            start = time.perf_counter()
+            df = self._candles_to_dataframe(candles)
+            metrics.observe('dataframe', time.perf_counter() - start, asset=asset, timeframe=timeframe_name)
+            trace = ohlc_data.get('trace')
+            if trace:
+                trace.mark('dataframe')
+            
+            if strategy is not None:
+                if len(df) >= strategy.min_candles:
+                    self.warm[(asset, timeframe_name)] = True
+                strategy_name = strategy_key.rsplit('_', 1)[0]
+                start = time.perf_counter()
+                try:
+                    signal = strategy.analyze(df)
+                except Exception:
+                    metrics.error('analyze', asset=asset, timeframe=timeframe_name, strategy=strategy_name)
+                    raise
+                metrics.observe('analyze', time.perf_counter() - start,
+                                asset=asset, timeframe=timeframe_name, strategy=strategy_name)
+                if trace:
+                    trace.mark(f'analyze:{strategy_name}')
+                if self.chart_listener and strategy.last_frame is not None:
+                    self._publish_chart(asset, timeframe_name, strategy.last_frame)
+                if signal and signal.get('confidence', 0) < self._min_confidence.get(strategy_key, 0):
+                    signal = {'signal': 'hold', 'confidence': signal.get('confidence', 0)}
             else:
                 signal = {'signal': 'hold', 'confidence': 0}
             
             # Add asset and timeframe to signal
             if signal and signal['signal'] != 'hold':
                 signal['asset'] = asset
-                signal['timeframe'] = self._seconds_to_timeframe(timeframe)
+                signal['timeframe'] = timeframe_name
+                signal['strategy'] = strategy_name
+                if trace:
+                    signal['trace'] = trace
+                self._add_trade_details(signal, candles[-1])
                 self._store_signal(signal)
                 return signal
         
         return None
     
     def _candles_to_dataframe(self, candles):
-        """Convert candles list to pandas DataFrame"""
+        """Convert candles (CandleColumns or a list of rows) to pandas DataFrame"""
+        pd = startup.lazy_import('pandas')
         if not candles:
             return pd.DataFrame()
-            
-        # Assuming candles format: [timestamp, open, high, low, close, volume]
-        df = pd.DataFrame(candles, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s')
-        df.set_index('timestamp', inplace=True)
-        return df
+        
+        columns = candles if isinstance(candles, CandleColumns) else from_rows(candles)
+        if columns is None:
+            # Assuming candles format: [timestamp, open, high, low, close, volume]
+            df = pd.DataFrame(candles, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s')
+            df.set_index('timestamp', inplace=True)
+            return df
+        
+        # Built from the column arrays directly, no per-candle Python objects
+        index = pd.DatetimeIndex(pd.to_datetime(columns.timestamp, unit='s'), name='timestamp')
+        return pd.DataFrame({
+            'open': columns.open, 'high': columns.high, 'low': columns.low,
+            'close': columns.close, 'volume': columns.volume
+        }, index=index)
+    
+    def _publish_chart(self, asset, timeframe, frame):
+        """Hand the candles that changed since the last publish to the chart listener"""
+        key = (asset, timeframe)
+        last_mark = self._chart_marks.get(key)
+        if last_mark is None:
+            changed = frame.tail(self.chart_window)
+        else:
+            # The newest published candle may still be forming, so resend it too
+            changed = frame[frame.index >= last_mark].tail(self.chart_window)
+        if changed.empty:
+            return
+        
+        self._chart_marks[key] = changed.index[-1]
+        try:
+            self.chart_listener(asset, timeframe, self._chart_rows(changed))
+        except Exception as e:
+            logger.error(f"Error publishing chart data: {e}")
+    
+    def _chart_rows(self, frame):
+        """Convert an indicator frame into plain rows, NaN becomes None"""
+        columns = [c for c in CHART_FIELDS if c in frame.columns]
+        rows = []
+        for timestamp, values in zip(frame.index, frame[columns].itertuples(index=False, name=None)):
+            row = {'time': int(timestamp.timestamp())}
+            for column, value in zip(columns, values):
+                value = float(value)
+                row[column] = None if math.isnan(value) else value
+            rows.append(row)
+        return rows
+    
+    def _add_trade_details(self, signal, last_candle):
+        """Attach entry price, candle time and expiry so the signal can be scored later"""
+        candle_time = int(last_candle[0])
+        expiry_minutes = TRADING_SETTINGS['expiry_minutes'].get(signal['timeframe'], 5)
+        
+        signal['entry_price'] = float(last_candle[4])
+        signal['candle_time'] = candle_time
+        signal['expiry'] = candle_time + expiry_minutes * 60
+        signal['timestamp'] = datetime.fromtimestamp(candle_time, timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
     
     def _seconds_to_timeframe(self, seconds):
         """Convert seconds to timeframe string"""
+        if isinstance(seconds, str): return seconds
         if seconds == 60: return '1m'
         if seconds == 120: return '2m'
         if seconds == 180: return '3m'
@@ -0,0 +1,123 @@
+import itertools
+import random
+import time
+from collections import deque
+from config.settings import TRACING_SETTINGS
+
+class ClockOffsetEstimator:
+    """
+    Estimates local clock minus broker clock from tick timestamps.
+
+    Each tick gives local_receive_time - broker_timestamp, which is the clock
+    offset plus that tick's network delay. The minimum over a sliding time
+    window is the best estimate (it still includes the minimum network delay).
+    Kept as a monotonic deque, so each observation is amortised O(1).
+    """
+    def __init__(self, window=300.0):
+        self.window = window
+        self._samples = deque()  # (local_time, delta), delta increasing
+
+    def observe(self, broker_ts, local_ts=None):
+        local_ts = local_ts or time.time()
+        delta = local_ts - broker_ts
+        samples = self._samples
+        while samples and samples[-1][1] >= delta:
+            samples.pop()
+        samples.append((local_ts, delta))
+        while samples[0][0] < local_ts - self.window:
+            samples.popleft()
+
+    @property
+    def offset(self):
+        """Seconds to add to a broker timestamp to express it in local time, None until seen a tick"""
+        return self._samples[0][1] if self._samples else None
+
+class Trace:
+    """Timestamps of one message as it moves through the pipeline"""
+    __slots__ = ('trace_id', 'kind', 'asset', 'timeframe', 'broker_ts', 'received', 'stages')
+
+    def __init__(self, trace_id, kind, asset, timeframe, broker_ts, received):
+        self.trace_id = trace_id
+        self.kind = kind
+        self.asset = asset
+        self.timeframe = timeframe
+        self.broker_ts = broker_ts
+        self.received = received
+        self.stages = [('receive', received)]
+
+    def mark(self, stage):
+        self.stages.append((stage, time.time()))
+
+    def to_dict(self):
+        return {
+            'trace_id': self.trace_id, 'kind': self.kind, 'asset': self.asset,
+            'timeframe': self.timeframe, 'broker_ts': self.broker_ts,
+            'received': self.received, 'stages': [list(s) for s in self.stages]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        trace = cls(data['trace_id'], data['kind'], data['asset'], data['timeframe'],
+                    data['broker_ts'], data['received'])
+        trace.stages = [tuple(s) for s in data['stages']]
+        return trace
+
+class Tracer:
+    """
+    Samples messages for end-to-end latency tracing.
+
+    Only a sample_rate fraction of messages get a Trace; the rest cost one
+    random() call. Finished traces land in a fixed-size ring.
+    """
+    def __init__(self, sample_rate=None, ring_size=None, offset_window=None):
+        self.sample_rate = TRACING_SETTINGS['sample_rate'] if sample_rate is None else sample_rate
+        self.clock = ClockOffsetEstimator(offset_window or TRACING_SETTINGS['offset_window'])
+        self._ring = deque(maxlen=ring_size or TRACING_SETTINGS['ring_size'])
+        self._ids = itertools.count(1)
+
+    def start(self, processed_data, received):
+        """Update the clock estimate from ticks, and maybe start a trace for this message"""
+        data_type = processed_data.get('type')
+        if data_type == 'tick':
+            broker_ts = _to_seconds(processed_data.get('timestamp'))
+            if broker_ts is not None:
+                self.clock.observe(broker_ts, received)
+        elif data_type == 'instrument_update':
+            candles = processed_data.get('candles')
+            broker_ts = _to_seconds(candles[-1][0]) if candles else None
+        else:
+            return None
+
+        if not self.sample_rate or random.random() >= self.sample_rate:
+            return None
+        return Trace(next(self._ids), data_type, processed_data.get('asset'),
+                     processed_data.get('period'), broker_ts, received)
+
+    def finish(self, trace, stage='emit'):
+        """Close a trace and store its summary in the ring"""
+        trace.mark(stage)
+        offset = self.clock.offset
+        end = trace.stages[-1][1]
+        record = trace.to_dict()
+        record['stages'] = [
+            {'stage': name, 'ms': round((at - trace.received) * 1000, 3)} for name, at in trace.stages
+        ]
+        record['pipeline_ms'] = round((end - trace.received) * 1000, 3)
+        record['clock_offset'] = offset
+        if trace.broker_ts is not None and offset is not None:
+            record['end_to_end_ms'] = round((end - (trace.broker_ts + offset)) * 1000, 3)
+        self._ring.append(record)
+
+    def recent(self, limit=100, asset=None):
+        """Newest-first finished traces"""
+        records = [r for r in reversed(self._ring) if asset is None or r['asset'] == asset]
+        return records[:limit]
+
+def _to_seconds(timestamp):
+    if timestamp is None:
+        return None
+    timestamp = float(timestamp)
+    return timestamp / 1000.0 if timestamp > 1e11 else timestamp
+
+# Process-wide tracer
+tracer = Tracer()
@@ -1,18 +1,27 @@
-import socketio
-import json
 import threading
 import time
-import cloudscraper
 from config.credentials import Credentials
-from utils.logger import setup_logger
+from core import candle_decoder
+from core.metrics import metrics
+from utils.logger import setup_logger, get_wire_logger
+from utils.startup import startup
 
 logger = setup_logger('websocket_client')
 
+# Broker events to start/stop candle updates for an asset and period
+SUBSCRIBE_EVENT = 'instruments/update'
+UNSUBSCRIBE_EVENT = 'instruments/unsubscribe'
+# Pause between consecutive subscribe requests, keeps us under the broker's rate limit
+SUBSCRIBE_INTERVAL = 0.5
+
 class QuotexWebSocketClient:
     def __init__(self):
         self.sio = None
         self.connected = False
         self.authenticated = False
+        self.subscribed = set()  # (asset, timeframe) subscriptions sent since the last auth
+        self.auth_event = threading.Event()  # Set once the broker accepts the session
+        self._subscription_lock = threading.Lock()
         self.on_message_callback = None
         self.session_token = None
         self.reconnect_attempts = 0
@@ -21,7 +30,7 @@ class QuotexWebSocketClient:
     def _get_session_via_http(self):
         """Fallback: obtain a fresh session token via HTTP login using cloudscraper"""
         try:
-            scraper = cloudscraper.create_scraper()
+            scraper = startup.lazy_import('cloudscraper').create_scraper()
             login_url = "https://qxbroker.com/api/login"
             payload = {
                 "email": Credentials.EMAIL,
@@ -47,6 +56,9 @@ class QuotexWebSocketClient:
 
     def connect(self):
         """Connect to Quotex using Socket.IO client"""
+        # Heavy client libraries are only loaded once the bot actually connects
+        socketio = startup.lazy_import('socketio')
+        cloudscraper = startup.lazy_import('cloudscraper')
         try:
             Credentials.validate()
             logger.info("Credentials validated. Proceeding with connection...")
@@ -69,12 +81,13 @@ class QuotexWebSocketClient:
             base_url = "https://ws2.qxbroker.com"
             logger.info(f"Connecting to Socket.IO server at {base_url}")
 
-            # Create Socket.IO client with detailed logging
+            # Create Socket.IO client with sampled wire-level logging
             self.sio = socketio.Client(
-                logger=True,           # Enable detailed logs
-                engineio_logger=True,  # Show handshake details
+                logger=get_wire_logger('socketio.client'),
+                engineio_logger=get_wire_logger('engineio.client'),
                 ssl_verify=False,
-                http_session=cloudscraper.create_scraper()
+                http_session=cloudscraper.create_scraper(),
+                json=candle_decoder.json_module()
             )
 
             # Event handlers
@@ -99,6 +112,8 @@ class QuotexWebSocketClient:
                 logger.warning("Socket.IO disconnected")
                 self.connected = False
                 self.authenticated = False
+                self.auth_event.clear()
+                self.subscribed.clear()
                 if self.reconnect_attempts < self.max_reconnect_attempts:
                     self.reconnect_attempts += 1
                     logger.info(f"Reconnecting in 5s (attempt {self.reconnect_attempts})")
@@ -110,6 +125,7 @@ class QuotexWebSocketClient:
                 logger.info(f"Authorization response: {data}")
                 if data.get('success') or data.get('status') == 'ok' or data.get('success') == True:
                     self.authenticated = True
+                    self.auth_event.set()
                     logger.info("Authentication successful!")
                     self.subscribe_to_assets()
                 else:
@@ -118,18 +134,15 @@ class QuotexWebSocketClient:
 
             @self.sio.on('tick')
             def on_tick(data):
-                if self.on_message_callback:
-                    self.on_message_callback(json.dumps(['tick', data]))
+                self._deliver('tick', data)
 
             @self.sio.on('instruments/update')
             def on_instruments(data):
-                if self.on_message_callback:
-                    self.on_message_callback(json.dumps(['instruments/update', data]))
+                self._deliver('instruments/update', data)
 
             @self.sio.on('*')
             def catch_all(event, data):
-                if self.on_message_callback:
-                    self.on_message_callback(json.dumps([event, data]))
+                self._deliver(event, data)
 
             # Connect with timeout
             self.sio.connect(
@@ -154,24 +167,68 @@ class QuotexWebSocketClient:
             logger.error(traceback.format_exc())
             return False
 
+    def _deliver(self, event, data):
+        """
+        Hand a received event, already decoded by the Socket.IO client, to the
+        message callback, with instrument update candles as column arrays.
+        The conversion is timed as the 'receive' step
+        """
+        if self.on_message_callback:
+            start = time.perf_counter()
+            if event == 'instruments/update' and isinstance(data, dict) and isinstance(data.get('candles'), list):
+                columns = candle_decoder.from_rows(data['candles'])
+                if columns is not None:
+                    data = dict(data, candles=columns)
+            asset = (data.get('asset') or data.get('symbol')) if isinstance(data, dict) else None
+            metrics.observe('receive', time.perf_counter() - start, asset=asset)
+            self.on_message_callback((event, data))
+
     def subscribe_to_assets(self):
-        if not self.authenticated or not self.sio:
-            return
+        """Subscribe to every configured asset/timeframe that is not subscribed yet"""
         from config.settings import TRADING_SETTINGS
-        assets = TRADING_SETTINGS['assets']
-        timeframes = TRADING_SETTINGS['timeframes']
-        for asset in assets:
-            for timeframe in timeframes:
+        self.update_subscriptions(
+            (asset, timeframe) for asset in TRADING_SETTINGS['assets'] for timeframe in TRADING_SETTINGS['timeframes']
+        )
+
+    def update_subscriptions(self, wanted):
+        """
+        Send only the difference between the current and wanted (asset, timeframe)
+        subscriptions. Returns (added, removed); nothing is sent before auth, the
+        auth handler subscribes to the configured set.
+        """
+        wanted = set(wanted)
+        if not self.authenticated or not self.sio:
+            return set(), set()
+        with self._subscription_lock:
+            removed = self.subscribed - wanted
+            added = wanted - self.subscribed
+            for asset, timeframe in sorted(removed):
                 try:
-                    period = self._timeframe_to_seconds(timeframe)
-                    self.sio.emit('instruments/update', {
+                    self.sio.emit(UNSUBSCRIBE_EVENT, {
                         'asset': asset,
-                        'period': period
+                        'period': self._timeframe_to_seconds(timeframe)
                     })
+                    self.subscribed.discard((asset, timeframe))
+                    logger.info(f"Unsubscribed from {asset} ({timeframe})")
+                except Exception as e:
+                    logger.error(f"Failed to unsubscribe from {asset}: {e}")
+            for i, (asset, timeframe) in enumerate(sorted(added)):
+                if i:
+                    time.sleep(SUBSCRIBE_INTERVAL)
+                try:
+                    self.sio.emit(SUBSCRIBE_EVENT, {
+                        'asset': asset,
+                        'period': self._timeframe_to_seconds(timeframe)
+                    })
+                    self.subscribed.add((asset, timeframe))
                     logger.info(f"Subscribed to {asset} ({timeframe})")
-                    time.sleep(0.5)
                 except Exception as e:
                     logger.error(f"Failed to subscribe to {asset}: {e}")
+        return added, removed
+
+    def wait_authenticated(self, timeout=15):
+        """Block until the broker accepts the session, returns False on timeout"""
+        return self.auth_event.wait(timeout)
 
     def _timeframe_to_seconds(self, timeframe):
         mapping = {'1m': 60, '2m': 120, '3m': 180, '5m': 300}
@@ -190,6 +247,7 @@ class QuotexWebSocketClient:
             self.sio.disconnect()
             self.connected = False
             self.authenticated = False
+            self.auth_event.clear()
             logger.info("Disconnected")
 
     @property
@@ -1,71 +1,293 @@
 import os
+import re
+import threading
+import time
 from flask import Flask, jsonify, request, send_file
-from flask_socketio import SocketIO
+from flask_socketio import SocketIO, emit, join_room, leave_room
+import hmac
 import json
+from config.settings import DASHBOARD_SETTINGS
+from config.credentials import Credentials
+from config.live_config import live_config
+from core.signal_journal import journal
+from core import metrics as metrics_module
+from core import performance as perf
+from core.metrics import metrics
+from core.profiler import profiler
+from core.tracing import tracer, Trace
+from dashboard.rooms import SubscriptionIndex
+from dashboard.http_cache import VersionedJSONCache
+from dashboard.assets import AssetCache, CachedAsset
+from dashboard.bridge import LoopBridge
+from dashboard.chart_stream import ChartStream, room_name as chart_room
+from dashboard.presence import PresenceTracker
+from dashboard.signal_ring import SignalRing
+from utils.startup import startup
 
 # Get absolute path to templates
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 TEMPLATE_DIR = os.path.join(BASE_DIR, 'templates')
 INDEX_PATH = os.path.join(TEMPLATE_DIR, 'index.html')
 
-app = Flask(__name__)
+# Static files are served from the in-memory AssetCache below
+app = Flask(__name__, static_folder=None)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev_secret_key')
 socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet')
 
+class EmissionScheduler:
+    """
+    Coalesces dashboard broadcasts into a single 'signal_batch' frame per window.
+
+    Signals and outcomes queued within one window are sent together and only the
+    latest performance snapshot is kept, so broadcast count scales with time
+    rather than with signal bursts. Signals and outcomes are routed only to the
+    filter rooms that match them.
+    """
+    def __init__(self, socketio, subscriptions, window_ms):
+        self.socketio = socketio
+        self.subscriptions = subscriptions
+        self.window = window_ms / 1000.0
+        self._signals = []
+        self._traces = []
+        self._outcomes = []
+        self._performance = None
+        self._scheduled = False
+        self._lock = threading.Lock()
+    
+    def queue_signal(self, signal, trace=None):
+        with self._lock:
+            self._signals.append(signal)
+            if trace is not None:
+                self._traces.append(trace)
+        self._schedule()
+    
+    def queue_outcome(self, outcome):
+        with self._lock:
+            self._outcomes.append(outcome)
+        self._schedule()
+    
+    def queue_performance(self, performance):
+        with self._lock:
+            self._performance = dict(performance)
+        self._schedule()
+    
+    def _schedule(self):
+        """Arm a single flush for the current window"""
+        if self.window <= 0:
+            self.flush()
+            return
+        with self._lock:
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self.socketio.start_background_task(self._flush_later)
+    
+    def _flush_later(self):
+        self.socketio.sleep(self.window)
+        self.flush()
+    
+    def flush(self):
+        """Send everything queued since the last flush as one frame"""
+        with self._lock:
+            signals, self._signals = self._signals, []
+            traces, self._traces = self._traces, []
+            outcomes, self._outcomes = self._outcomes, []
+            performance, self._performance = self._performance, None
+            self._scheduled = False
+        
+        if not (signals or outcomes or performance):
+            return
+        
+        start = time.perf_counter()
+        # Group signals and outcomes per matching room, one frame per room
+        frames = {}
+        for key, items in (('signals', signals), ('outcomes', outcomes)):
+            for item in items:
+                for room in self.subscriptions.match(item):
+                    frame = frames.setdefault(room, {'signals': [], 'outcomes': []})
+                    frame[key].append(item)
+        
+        for room, frame in frames.items():
+            self.socketio.emit('signal_batch', frame, to=room)
+        
+        if performance:
+            self.socketio.emit('signal_batch', {'performance': performance})
+        metrics.observe('emit', time.perf_counter() - start)
+        for trace in traces:
+            tracer.finish(trace, 'emit')
+
+subscriptions = SubscriptionIndex()
+charts = ChartStream(socketio, window=DASHBOARD_SETTINGS['chart_window'])
+presence = PresenceTracker(socketio, interval=DASHBOARD_SETTINGS['presence_interval'])
+emitter = EmissionScheduler(socketio, subscriptions, DASHBOARD_SETTINGS['emit_window_ms'])
+bridge = LoopBridge(
+    socketio,
+    interval=DASHBOARD_SETTINGS['bridge_interval'],
+    batch=DASHBOARD_SETTINGS['bridge_batch'],
+    max_pending=DASHBOARD_SETTINGS['bridge_max_pending'],
+    max_interval=DASHBOARD_SETTINGS['bridge_idle_interval']
+).start()
+
 class Dashboard:
-    def __init__(self):
-        self.signals = []
-        self.performance = {
-            'total_signals': 0,
-            'winning_signals': 0,
-            'losing_signals': 0,
-            'total_profit': 0
-        }
+    def __init__(self, signal_capacity=None):
+        # Newest signals; their ids are the ring's sequence numbers, never reused. Over the
+        # signal bus they are the producer's, so every worker serves the same ids and ETags
+        self._signals = SignalRing(signal_capacity or DASHBOARD_SETTINGS['signal_capacity'])
+        # Start time of the producer the ids come from, 0 when the bot runs in this process
+        self.epoch = 0
+        # Replaced, never mutated, so readers always see a consistent set of totals
+        self.performance = perf.empty()
+        # Latest status (metrics etc.) reported by a separate producer process
+        self.producer_status = None
+        # Callable returning the in-process bot's readiness, set by main.py
+        self.readiness_provider = None
+        # Version number backs the performance ETag; the signal sequence backs the signals one
+        # (both with the epoch)
+        self.performance_version = 0
     
-    def add_signal(self, signal):
+    @property
+    def signals(self):
+        """Newest-first tuple of recent signals"""
+        return self._signals.snapshot()[1]
+    
+    def signal_snapshot(self):
+        """(last id, newest-first signals) taken together, without locking the writer"""
+        return self._signals.snapshot()
+    
+    # add_signal, record_outcome and publish_chart are called from bot threads;
+    # the actual work is handed to the web loop through the bridge.
+    # When the event came over the signal bus, performance is the producer's
+    # totals after it and seq/epoch its producer sequence number and start time
+    def add_signal(self, signal, performance=None, seq=None, epoch=None):
+        bridge.post(self._add_signal, signal, performance, seq, epoch)
+    
+    def record_outcome(self, outcome, performance=None, seq=None, epoch=None):
+        """Apply a resolved signal outcome to the running performance totals"""
+        bridge.post(self._record_outcome, outcome, performance, seq, epoch)
+    
+    def publish_chart(self, asset, timeframe, rows):
+        """Forward candle/indicator rows computed by StrategyEngine to chart subscribers"""
+        bridge.post(charts.apply, asset, timeframe, rows)
+    
+    def _add_signal(self, signal, performance=None, seq=None, epoch=None):
+        self._follow_epoch(epoch)
         formatted_signal = {
-            'id': len(self.signals) + 1,
+            'id': seq or self._signals.seq + 1,
             'asset': signal.get('asset', 'Unknown'),
             'direction': signal.get('signal', 'hold').upper(),
             'confidence': signal.get('confidence', 0),
             'timestamp': signal.get('timestamp', ''),
             'timeframe': signal.get('timeframe', ''),
+            'strategy': signal.get('strategy', ''),
             'type': signal.get('type', 'unknown')
         }
         
-        self.signals.insert(0, formatted_signal)
-        self.signals = self.signals[:20]
+        self._signals.append(formatted_signal, formatted_signal['id'])
+        
+        self.performance = performance or perf.count_signal(self.performance)
+        self.performance_version = seq or self.performance_version + 1
         
-        self.performance['total_signals'] += 1
+        trace = signal.get('trace')
+        if isinstance(trace, dict):
+            trace = Trace.from_dict(trace)
+        if trace is not None:
+            trace.mark('queue')
+        
+        emitter.queue_signal(formatted_signal, trace)
+        emitter.queue_performance(self.performance)
+    
+    def _record_outcome(self, outcome, performance=None, seq=None, epoch=None):
+        self._follow_epoch(epoch)
+        self.performance = performance or perf.count_outcome(self.performance, outcome)
+        self.performance_version = seq or self.performance_version + 1
         
-        socketio.emit('new_signal', formatted_signal)
-        socketio.emit('performance_update', self.performance)
+        emitter.queue_outcome(outcome)
+        emitter.queue_performance(self.performance)
+    
+    def _follow_epoch(self, epoch):
+        """A restarted producer numbers from 1 again, so drop the signals numbered by the old one"""
+        if epoch is not None and epoch != self.epoch:
+            self.epoch = epoch
+            self._signals.reset()
+            self.performance_version = 0
+
+    def update_status(self, status):
+        """Keep the producer's periodic status report when the bot runs in another process"""
+        self.producer_status = status
+    
+    def readiness(self):
+        """Bot readiness from this process, or as last reported by the producer"""
+        if self.readiness_provider:
+            return self.readiness_provider()
+        if self.producer_status and self.producer_status.get('readiness'):
+            return self.producer_status['readiness']
+        return {'ready': False, 'reason': 'bot not started'}
 
 # Global dashboard instance
 dashboard = Dashboard()
 
+STATIC_URL_PATTERN = re.compile(r"\{\{\s*url_for\('static',\s*filename='([^']+)'\)\s*\}\}")
+STATIC_FILES = {
+    'css/dashboard.css': 'text/css; charset=utf-8',
+    'js/dashboard.js': 'application/javascript; charset=utf-8'
+}
+
+def render_index(html, cache):
+    """Point static references at versioned URLs so they can be cached forever"""
+    return STATIC_URL_PATTERN.sub(
+        lambda m: cache.url_for(m.group(1), f"/static/{m.group(1)}"), html
+    )
+
+assets = AssetCache(check_interval=DASHBOARD_SETTINGS['asset_check_interval'])
+for filename, content_type in STATIC_FILES.items():
+    assets.register(filename, [
+        os.path.join(BASE_DIR, 'static', filename),
+        os.path.join(os.path.dirname(__file__), 'static', filename)
+    ], content_type)
+assets.register('index.html', [
+    '/opt/render/project/src/templates/index.html',  # Render path
+    os.path.join(os.path.dirname(__file__), 'templates', 'index.html'),  # Relative path
+    INDEX_PATH,  # Main directory
+    os.path.join(BASE_DIR, 'template', 'index.html'),
+    'templates/index.html'  # Current directory
+], 'text/html; charset=utf-8', render=render_index, dependencies=STATIC_FILES)
+assets.preload()
+
+_fallback_asset = None
+
+def serve_asset(asset, cache_control):
+    """Send the best precompressed variant, or 304 when the client's copy is current"""
+    encoding, body, etag = asset.select(request.headers.get('Accept-Encoding'))
+    headers = {'ETag': etag, 'Cache-Control': cache_control, 'Vary': 'Accept-Encoding'}
+    if request.if_none_match.contains(etag.strip('"')):
+        return app.response_class(status=304, headers=headers)
+    if encoding != 'identity':
+        headers['Content-Encoding'] = encoding
+    return app.response_class(body, content_type=asset.content_type, headers=headers)
+
 @app.route('/')
 def index():
     """Serve dashboard HTML - guaranteed to work"""
-    try:
-        # Try to find the template file
-        possible_paths = [
-            '/opt/render/project/src/templates/index.html',  # Render path
-            os.path.join(os.path.dirname(__file__), 'templates', 'index.html'),  # Relative path
-            os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates', 'index.html'),  # Main directory
-            'templates/index.html'  # Current directory
-        ]
-        
-        for template_path in possible_paths:
-            if os.path.exists(template_path):
-                with open(template_path, 'r', encoding='utf-8') as f:
-                    return f.read(), 200, {'Content-Type': 'text/html'}
-        
-        # If no template found, CREATE IT PROGRAMMATICALLY
-        return create_fallback_dashboard()
-        
-    except Exception as e:
-        return create_fallback_dashboard()
+    global _fallback_asset
+    asset = assets.get('index.html')
+    if asset is None:
+        # If no template found, build the fallback page once and keep it
+        if _fallback_asset is None:
+            html_content = create_fallback_dashboard()[0]
+            _fallback_asset = CachedAsset('fallback', 'text/html; charset=utf-8', html_content.encode('utf-8'))
+        asset = _fallback_asset
+    # HTML must revalidate so new asset versions are picked up
+    return serve_asset(asset, 'no-cache')
+
+@app.route('/static/<path:filename>')
+def static_files(filename):
+    if filename not in STATIC_FILES:
+        return jsonify({'error': 'not found'}), 404
+    asset = assets.get(filename)
+    if asset is None:
+        return jsonify({'error': 'not found'}), 404
+    # Versioned URLs change with content, so the files themselves never go stale
+    return serve_asset(asset, 'public, max-age=31536000, immutable')
 
 def create_fallback_dashboard():
     """Create dashboard HTML programmatically as fallback"""
@@ -112,21 +334,26 @@ def create_fallback_dashboard():
         
         <script>
             const socket = io();
-            socket.on('new_signal', function(signal) {
+            socket.on('signal_batch', function(batch) {
                 const container = document.getElementById('signals-container');
-                const signalElement = document.createElement('div');
-                signalElement.className = 'signal';
-                signalElement.innerHTML = `
-                    <div>${signal.timestamp}</div>
-                    <div>${signal.asset}</div>
-                    <div class="${signal.direction.toLowerCase()}">${signal.direction}</div>
-                    <div>${signal.timeframe}</div>
-                    <div>${signal.confidence}%</div>
-                `;
-                container.insertBefore(signalElement, container.firstChild);
+                (batch.signals || []).forEach(function(signal) {
+                    const signalElement = document.createElement('div');
+                    signalElement.className = 'signal';
+                    signalElement.innerHTML = `
+                        <div>${signal.timestamp}</div>
+                        <div>${signal.asset}</div>
+                        <div class="${signal.direction.toLowerCase()}">${signal.direction}</div>
+                        <div>${signal.timeframe}</div>
+                        <div>${signal.confidence}%</div>
+                    `;
+                    container.insertBefore(signalElement, container.firstChild);
+                });
+                if (batch.performance) {
+                    updatePerformance(batch.performance);
+                }
             });
             
-            socket.on('performance_update', function(data) {
+            function updatePerformance(data) {
                 document.getElementById('total-signals').textContent = data.total_signals;
                 document.getElementById('winning-signals').textContent = data.winning_signals;
                 document.getElementById('losing-signals').textContent = data.losing_signals;
@@ -135,7 +362,7 @@ def create_fallback_dashboard():
                 const winRate = data.total_signals > 0 ? 
                     ((data.winning_signals / data.total_signals) * 100).toFixed(1) : 0;
                 document.getElementById('win-rate').textContent = winRate + '%';
-            });
+            }
         </script>
     </body>
     </html>
@@ -182,24 +409,203 @@ def debug_files():
 
 @app.route('/health')
 def health_check():
+    """Liveness only: the web process is up and answering"""
     return jsonify({'status': 'healthy'})
 
+@app.route('/ready')
+def ready_check():
+    """Readiness: connected, subscribed and indicators warm; 503 until then"""
+    readiness = dict(dashboard.readiness())
+    readiness.setdefault('startup', startup.snapshot())
+    return jsonify(readiness), 200 if readiness.get('ready') else 503
+
+signals_cache = VersionedJSONCache('signals')
+performance_cache = VersionedJSONCache('performance')
+
+def cached_json_response(etag, body):
+    """Serve a pre-serialized body, or 304 when the client already has this version"""
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if request.if_none_match.contains(etag.strip('"')):
+        return app.response_class(status=304, headers=headers)
+    return app.response_class(body, mimetype='application/json', headers=headers)
+
+@app.route('/metrics')
+def get_metrics():
+    """Per-stage latency quantiles, throughput and error counters as plain text"""
+    body = metrics_module.render(metrics.snapshot())
+    status = dashboard.producer_status
+    if status and status.get('metrics'):
+        body += metrics_module.render(status['metrics'], extra_labels={'process': 'producer'})
+    snapshot = presence.snapshot()
+    for namespace, count in snapshot['clients'].items():
+        body += f'dashboard_clients{{namespace="{namespace}"}} {count}\n'
+    body += f'dashboard_presence_broadcasts_total {snapshot["broadcasts"]}\n'
+    body += f'dashboard_bridge_pending {bridge.pending}\n'
+    body += f'dashboard_bridge_dropped_total {bridge.dropped}\n'
+    return body, 200, {'Content-Type': 'text/plain; version=0.0.4'}
+
+@app.route('/api/traces')
+def get_traces():
+    """Sampled end-to-end traces, newest first, with the current broker clock offset"""
+    limit = request.args.get('limit', 100, type=int)
+    asset = request.args.get('asset')
+    traces = tracer.recent(limit, asset)
+    clock_offset = tracer.clock.offset
+    status = dashboard.producer_status
+    if status:
+        # Traces that ended inside the producer (no signal emitted)
+        traces += [t for t in status.get('traces', []) if asset is None or t['asset'] == asset]
+        traces = sorted(traces, key=lambda t: t['received'], reverse=True)[:limit]
+        if clock_offset is None:
+            clock_offset = status.get('clock_offset')
+    return jsonify({
+        'sample_rate': tracer.sample_rate,
+        'clock_offset': clock_offset,
+        'traces': traces
+    })
+
+@app.route('/api/presence')
+def get_presence():
+    """Connected clients per namespace and per room"""
+    snapshot = presence.snapshot()
+    snapshot['rooms'] = dict(subscriptions.room_sizes(), **charts.subscriber_counts())
+    return jsonify(snapshot)
+
 @app.route('/api/signals')
 def get_signals():
-    return jsonify(dashboard.signals)
+    """
+    Newest-first signals, capped at limit. With since, only those with
+    id > since, and when more than limit remain the oldest of them, so a
+    client moving since to the largest id it got pages through without gaps
+    """
+    since = request.args.get('since', type=int)
+    limit = request.args.get('limit', type=int)
+    if limit is not None and limit < 1:
+        return jsonify({'error': 'limit must be positive'}), 400
+    
+    last_id, signals = dashboard.signal_snapshot()
+    
+    def build():
+        selected = signals
+        if since is not None:
+            selected = [s for s in selected if s['id'] > since]
+            return selected[-limit:] if limit else selected
+        return selected[:limit] if limit else selected
+    
+    etag, body = signals_cache.get(f"{dashboard.epoch}-{last_id}", (since, limit), build)
+    response = cached_json_response(etag, body)
+    response.headers['X-Last-Id'] = str(last_id)
+    # Oldest id still kept: a since below it means older signals were already dropped
+    response.headers['X-First-Id'] = str(signals[-1]['id'] if signals else last_id)
+    return response
+
+@app.route('/api/signals/history')
+def get_signal_history():
+    """Journaled signals in [start, end) (unix seconds), filtered by asset/strategy/timeframe"""
+    try:
+        limit = min(request.args.get('limit', 500, type=int), 5000)
+        rows = journal.query(
+            asset=request.args.get('asset'),
+            strategy=request.args.get('strategy'),
+            timeframe=request.args.get('timeframe'),
+            start=request.args.get('start', type=float),
+            end=request.args.get('end', type=float),
+            limit=limit
+        )
+        return jsonify(rows)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
 @app.route('/api/performance')
 def get_performance():
-    return jsonify(dashboard.performance)
+    version = f"{dashboard.epoch}-{dashboard.performance_version}"
+    etag, body = performance_cache.get(version, (), lambda: dashboard.performance)
+    return cached_json_response(etag, body)
+
+def admin_authorized():
+    """Bearer token check for /admin routes, always refused when ADMIN_TOKEN is not set"""
+    token = Credentials.ADMIN_TOKEN
+    supplied = request.headers.get('Authorization', '')
+    return bool(token) and hmac.compare_digest(supplied, f'Bearer {token}')
+
+@app.route('/admin/config', methods=['GET', 'POST'])
+def admin_config():
+    """Read or change assets, timeframes and strategy settings without a restart"""
+    if not admin_authorized():
+        return jsonify({'error': 'unauthorized'}), 401
+    if request.method == 'POST':
+        try:
+            live_config.submit(request.get_json(force=True, silent=True))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        # Applied in the background; a GET shows the new version once pending is back to 0
+        return jsonify({'accepted': True, 'version': live_config.version, 'pending': live_config.pending}), 202
+    return jsonify({'version': live_config.version, 'pending': live_config.pending, 'config': live_config.current()})
+
+@app.route('/admin/profile', methods=['GET', 'POST'])
+def admin_profile():
+    """Sample this process for ?seconds= and return hot stacks and per-strategy time"""
+    if not admin_authorized():
+        return jsonify({'error': 'unauthorized'}), 401
+    try:
+        report = profiler.profile(
+            request.args.get('seconds', 10.0, type=float),
+            interval=request.args.get('interval', type=float),
+            include_idle=request.args.get('idle') in ('1', 'true')
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 409
+    if request.args.get('format') == 'collapsed':
+        # Folded stacks, ready for flamegraph.pl or speedscope
+        return app.response_class('\n'.join(report['collapsed']) + '\n', mimetype='text/plain', headers={
+            'Content-Disposition': f'attachment; filename=profile-{int(time.time())}.folded'
+        })
+    return jsonify(report)
 
 @socketio.on('connect')
 def handle_connect():
-    socketio.emit('clients_update', len(socketio.server.manager.rooms))
+    # Every client starts unfiltered until it sends its own filters
+    _, room = subscriptions.subscribe(request.sid)
+    join_room(room)
+    presence.connected()
 
 @socketio.on('disconnect')
 def handle_disconnect():
-    socketio.emit('clients_update', len(socketio.server.manager.rooms))
+    subscriptions.unsubscribe(request.sid)
+    charts.unsubscribe(request.sid)
+    presence.disconnected()
+
+@socketio.on('subscribe_filters')
+def handle_subscribe_filters(filters):
+    """Route only signals matching {'assets': [...], 'timeframes': [...], 'strategies': [...]}"""
+    try:
+        previous, room = subscriptions.subscribe(request.sid, filters)
+    except ValueError as e:
+        # The client keeps its current room
+        return {'error': str(e)}
+    if previous and previous != room:
+        leave_room(previous)
+    join_room(room)
+    return {'room': room, 'filters': subscriptions.filters_of(room)}
+
+@socketio.on('chart_subscribe')
+def handle_chart_subscribe(data):
+    """Join the chart feed for {'asset': ..., 'timeframe': ...}, the snapshot comes back as the ack"""
+    asset, timeframe = data.get('asset'), data.get('timeframe')
+    if not asset or not timeframe:
+        return {'error': 'asset and timeframe are required'}
+    join_room(chart_room(asset, timeframe))
+    return charts.subscribe(request.sid, asset, timeframe)
+
+@socketio.on('chart_unsubscribe')
+def handle_chart_unsubscribe(data):
+    asset, timeframe = data.get('asset'), data.get('timeframe')
+    for key in charts.unsubscribe(request.sid, asset, timeframe):
+        leave_room(chart_room(*key))
 
 @socketio.on('clients_update')
 def handle_clients_update():
-    socketio.emit('clients_update', len(socketio.server.manager.rooms))
+    # Answer only the asking client, the debounced broadcast covers everyone else
+    emit('clients_update', presence.count())
@@ -0,0 +1,99 @@
+import gzip
+import hashlib
+import os
+import threading
+import time
+
+# Brotli is optional, gzip is always available
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+class CachedAsset:
+    """One file held in memory with its precompressed variants"""
+    def __init__(self, name, content_type, body, path=None, mtime=None):
+        self.name = name
+        self.content_type = content_type
+        self.path = path
+        self.mtime = mtime
+        self.dependency_versions = ()
+        self.version = hashlib.sha1(body).hexdigest()[:16]
+        self.variants = {'identity': body, 'gzip': gzip.compress(body, compresslevel=9)}
+        if HAS_BROTLI:
+            self.variants['br'] = brotli.compress(body)
+
+    def select(self, accept_encoding):
+        """Pick the smallest variant the client accepts: (encoding, body, etag)"""
+        accepted = {part.split(';')[0].strip() for part in (accept_encoding or '').split(',')}
+        for encoding in ('br', 'gzip'):
+            if encoding in accepted and encoding in self.variants:
+                return encoding, self.variants[encoding], f'"{self.version}-{encoding}"'
+        return 'identity', self.variants['identity'], f'"{self.version}"'
+
+class AssetCache:
+    """
+    Serves dashboard files from memory.
+
+    Each file is read and compressed once, then re-read only when its mtime
+    changes. The mtime itself is checked at most once per check_interval, so
+    steady-state requests do no disk I/O at all.
+    """
+    def __init__(self, check_interval=2.0):
+        self.check_interval = check_interval
+        self._specs = {}   # {name: (candidates, content_type, render, dependencies)}
+        self._assets = {}  # {name: CachedAsset}
+        self._checked = {}  # {name: monotonic time of last mtime check}
+        self._lock = threading.Lock()
+
+    def register(self, name, candidates, content_type, render=None, dependencies=()):
+        """
+        Register a file under name. render(text, cache) may rewrite the file
+        contents, and dependencies are other asset names whose change forces a rebuild.
+        """
+        self._specs[name] = (candidates, content_type, render, tuple(dependencies))
+
+    def get(self, name):
+        """Current CachedAsset for name, or None when no candidate file exists"""
+        asset = self._assets.get(name)
+        now = time.monotonic()
+        if asset is not None and now - self._checked.get(name, 0) < self.check_interval:
+            return asset
+
+        candidates, content_type, render, dependencies = self._specs[name]
+        dependency_versions = tuple(
+            getattr(self.get(dependency), 'version', None) for dependency in dependencies
+        )
+
+        with self._lock:
+            self._checked[name] = now
+            path = next((p for p in candidates if os.path.isfile(p)), None)
+            if path is None:
+                self._assets.pop(name, None)
+                return None
+
+            mtime = os.stat(path).st_mtime
+            if (asset is not None and asset.path == path and asset.mtime == mtime
+                    and asset.dependency_versions == dependency_versions):
+                return asset
+
+            with open(path, 'rb') as f:
+                body = f.read()
+            if render:
+                body = render(body.decode('utf-8'), self).encode('utf-8')
+
+            asset = CachedAsset(name, content_type, body, path=path, mtime=mtime)
+            asset.dependency_versions = dependency_versions
+            self._assets[name] = asset
+            return asset
+
+    def preload(self):
+        """Load every registered asset up front so the first request hits memory"""
+        for name in self._specs:
+            self.get(name)
+
+    def url_for(self, name, url):
+        """Versioned URL for a cached asset, suitable for immutable caching"""
+        asset = self._assets.get(name)
+        return f"{url}?v={asset.version}" if asset else url
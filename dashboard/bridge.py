@@ -0,0 +1,81 @@
+import time
+from collections import deque
+from core.metrics import metrics
+from utils.logger import setup_logger
+
+logger = setup_logger('dashboard_bridge')
+
+class LoopBridge:
+    """
+    Hands work from bot threads over to the web server's event loop.
+
+    The bot, shard merge and signal bus threads can be native threads outside
+    the eventlet hub, where socketio.emit and start_background_task are not
+    safe and stall the web server. They post() calls instead, which is only
+    a deque append (atomic under the GIL), so they never lock or touch the
+    hub. A green thread inside the hub runs the queued calls in order, at
+    most `batch` per pass before yielding, so dashboard state changes and
+    emits all happen on the web loop and a burst never starves requests.
+
+    While idle the drain task backs off, doubling its sleep up to
+    max_interval, and drops back to interval as soon as it finds work, so an
+    idle dashboard is not woken 200 times a second. post() can't wake it
+    directly: a native thread must not touch the hub.
+
+    The time from post() to run is recorded as the 'bridge_lag' stage.
+    """
+    def __init__(self, socketio, interval=0.005, batch=200, max_pending=10000, max_interval=0.05):
+        self.socketio = socketio
+        self.interval = interval
+        self.max_interval = max(max_interval, interval)
+        self.batch = batch
+        self.max_pending = max_pending
+        self._queue = deque()
+        self._started = False
+        self.dropped = 0
+
+    def start(self):
+        """Start the drain task; call from the web loop (e.g. at import in the worker)"""
+        if not self._started:
+            self._started = True
+            self.socketio.start_background_task(self._drain_loop)
+        return self
+
+    def post(self, func, *args):
+        """Queue func(*args) to run on the web loop, False if the queue is full"""
+        if len(self._queue) >= self.max_pending:
+            self.dropped += 1
+            metrics.error('bridge')
+            return False
+        self._queue.append((time.perf_counter(), func, args))
+        return True
+
+    @property
+    def pending(self):
+        return len(self._queue)
+
+    def drain(self, limit=None):
+        """Run up to limit queued calls (all when None), returns how many ran"""
+        queue = self._queue
+        ran = 0
+        while queue and (limit is None or ran < limit):
+            queued, func, args = queue.popleft()
+            metrics.observe('bridge_lag', time.perf_counter() - queued)
+            try:
+                func(*args)
+            except Exception as e:
+                logger.error(f"Error running {getattr(func, '__name__', func)} on the web loop: {e}")
+            ran += 1
+        return ran
+
+    def _drain_loop(self):
+        delay = self.interval
+        while True:
+            ran = self.drain(self.batch)
+            if self._queue:
+                # Still behind: only yield to requests
+                delay = self.interval
+                self.socketio.sleep(0)
+                continue
+            delay = self.interval if ran else min(delay * 2, self.max_interval)
+            self.socketio.sleep(delay)
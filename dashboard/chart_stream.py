@@ -0,0 +1,79 @@
+import threading
+from collections import deque
+
+class ChartStream:
+    """
+    Live per-(asset, timeframe) chart feed for dashboard clients.
+
+    Keeps a bounded window of candles with indicator values for each key.
+    Subscribers get the window once as a snapshot, then only new candles and
+    the fields of the last candle that actually changed.
+    """
+    def __init__(self, socketio, window=200):
+        self.socketio = socketio
+        self.window = window
+        self._candles = {}      # {(asset, timeframe): deque of rows}
+        self._subscribers = {}  # {(asset, timeframe): subscriber count}
+        self._client_keys = {}  # {sid: set((asset, timeframe))}
+        self._lock = threading.Lock()
+
+    def apply(self, asset, timeframe, rows):
+        """Merge rows from StrategyEngine and send the resulting delta to subscribers"""
+        key = (asset, timeframe)
+        appended, changed = [], None
+        with self._lock:
+            candles = self._candles.get(key)
+            if candles is None:
+                candles = self._candles[key] = deque(maxlen=self.window)
+            for row in rows:
+                last = candles[-1] if candles else None
+                if last is not None and row['time'] == last['time']:
+                    diff = {k: v for k, v in row.items() if last.get(k) != v}
+                    if diff:
+                        last.update(diff)
+                        changed = dict(diff, time=row['time'])
+                elif last is None or row['time'] > last['time']:
+                    candles.append(dict(row))
+                    appended.append(row)
+            subscribed = self._subscribers.get(key, 0) > 0
+
+        if subscribed and (appended or changed):
+            delta = {'asset': asset, 'timeframe': timeframe}
+            if appended:
+                delta['append'] = appended
+            if changed:
+                # Applies to the candle that was last before any appended ones
+                delta['update'] = changed
+            self.socketio.emit('chart_delta', delta, to=room_name(asset, timeframe))
+
+    def subscribe(self, sid, asset, timeframe):
+        """Register a client for a key and return the snapshot it should start from"""
+        key = (asset, timeframe)
+        with self._lock:
+            keys = self._client_keys.setdefault(sid, set())
+            if key not in keys:
+                keys.add(key)
+                self._subscribers[key] = self._subscribers.get(key, 0) + 1
+            candles = [dict(c) for c in self._candles.get(key, ())]
+        return {'asset': asset, 'timeframe': timeframe, 'candles': candles}
+
+    def unsubscribe(self, sid, asset=None, timeframe=None):
+        """Drop one key for a client, or every key when asset is None; returns dropped keys"""
+        with self._lock:
+            keys = self._client_keys.get(sid, set())
+            dropped = list(keys) if asset is None else [k for k in keys if k == (asset, timeframe)]
+            for key in dropped:
+                keys.discard(key)
+                self._subscribers[key] -= 1
+                if not self._subscribers[key]:
+                    del self._subscribers[key]
+            if not keys:
+                self._client_keys.pop(sid, None)
+        return dropped
+
+    def subscriber_counts(self):
+        """Subscriber count per chart room"""
+        return {room_name(*key): count for key, count in self._subscribers.items()}
+
+def room_name(asset, timeframe):
+    return f"chart:{asset}:{timeframe}"
@@ -0,0 +1,40 @@
+import json
+import threading
+
+class VersionedJSONCache:
+    """
+    Pre-serialized JSON bodies tied to a state version number.
+
+    Bodies are built once per (version, parameters) and reused until the
+    version moves on, at which point the whole cache is dropped.
+    """
+    def __init__(self, name, max_entries=64):
+        self.name = name
+        self.max_entries = max_entries
+        self._version = None
+        self._entries = {}  # {params: (etag, body)}
+        self._lock = threading.Lock()
+
+    def get(self, version, params, build):
+        """
+        Return (etag, body) for the given state version and request parameters,
+        calling build() only when nothing is cached yet
+        """
+        with self._lock:
+            if version != self._version:
+                self._entries = {}
+                self._version = version
+            cached = self._entries.get(params)
+        if cached:
+            return cached
+
+        body = json.dumps(build(), separators=(',', ':'), default=str)
+        suffix = '-'.join(str(p) for p in params if p is not None)
+        etag = f'"{self.name}-{version}{"-" + suffix if suffix else ""}"'
+
+        with self._lock:
+            if version == self._version:
+                if len(self._entries) >= self.max_entries:
+                    self._entries.clear()
+                self._entries[params] = (etag, body)
+        return etag, body
@@ -0,0 +1,61 @@
+import threading
+import time
+
+class PresenceTracker:
+    """
+    Connected-client counters with debounced 'clients_update' broadcasts.
+
+    Connects and disconnects only touch an integer per namespace. The count is
+    broadcast at most once per interval however many clients come and go, so
+    a reconnect storm costs one message per interval instead of one per event.
+    """
+    def __init__(self, socketio, interval=1.0):
+        self.socketio = socketio
+        self.interval = interval
+        self._counts = {}  # {namespace: connected clients}
+        self._scheduled = False
+        self._last_broadcast = 0.0
+        self._lock = threading.Lock()
+        self.events = 0
+        self.broadcasts = 0
+
+    def connected(self, namespace='/'):
+        with self._lock:
+            self._counts[namespace] = self._counts.get(namespace, 0) + 1
+            self.events += 1
+        self._schedule()
+
+    def disconnected(self, namespace='/'):
+        with self._lock:
+            self._counts[namespace] = max(0, self._counts.get(namespace, 0) - 1)
+            self.events += 1
+        self._schedule()
+
+    def count(self, namespace='/'):
+        return self._counts.get(namespace, 0)
+
+    def _schedule(self):
+        with self._lock:
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self.socketio.start_background_task(self._broadcast_later)
+
+    def _broadcast_later(self):
+        delay = self._last_broadcast + self.interval - time.monotonic()
+        if delay > 0:
+            self.socketio.sleep(delay)
+        with self._lock:
+            self._scheduled = False
+            self._last_broadcast = time.monotonic()
+            self.broadcasts += 1
+            counts = dict(self._counts)
+        for namespace, count in counts.items():
+            self.socketio.emit('clients_update', count, namespace=namespace)
+
+    def snapshot(self):
+        return {
+            'clients': dict(self._counts),
+            'events': self.events,
+            'broadcasts': self.broadcasts
+        }
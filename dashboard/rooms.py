@@ -0,0 +1,117 @@
+import hashlib
+import threading
+
+WILDCARD = '*'
+DIMENSIONS = ('assets', 'timeframes', 'strategies')
+SIGNAL_FIELDS = {'assets': 'asset', 'timeframes': 'timeframe', 'strategies': 'strategy'}
+
+class SubscriptionIndex:
+    """
+    Maps dashboard clients to Socket.IO rooms by their signal filters.
+
+    Clients with identical filters share one room. Each room is indexed under
+    every asset, timeframe and strategy value it accepts (or the wildcard), so
+    routing a signal only touches the rooms that match it, never the clients.
+    """
+    def __init__(self):
+        self._filters = {}      # {room: normalised filter}
+        self._members = {}      # {room: set(sid)}
+        self._client_room = {}  # {sid: room}
+        self._index = {dimension: {} for dimension in DIMENSIONS}  # {dimension: {value: set(room)}}
+        self._lock = threading.Lock()
+
+    def subscribe(self, sid, filters=None):
+        """
+        Move a client to the room for its filters
+        Returns: (previous_room, new_room)
+        """
+        normalised = normalise_filters(filters)
+        room = room_name(normalised)
+
+        with self._lock:
+            previous = self._remove_locked(sid)
+            if room not in self._filters:
+                self._filters[room] = normalised
+                for dimension in DIMENSIONS:
+                    for value in normalised[dimension] or (WILDCARD,):
+                        self._index[dimension].setdefault(value, set()).add(room)
+            self._members.setdefault(room, set()).add(sid)
+            self._client_room[sid] = room
+        return previous, room
+
+    def unsubscribe(self, sid):
+        """Drop a client, returns the room it was in"""
+        with self._lock:
+            return self._remove_locked(sid)
+
+    def _remove_locked(self, sid):
+        room = self._client_room.pop(sid, None)
+        if room is None:
+            return None
+
+        members = self._members.get(room)
+        members.discard(sid)
+        if not members:
+            # Last member gone, forget the room and its index entries
+            del self._members[room]
+            normalised = self._filters.pop(room)
+            for dimension in DIMENSIONS:
+                for value in normalised[dimension] or (WILDCARD,):
+                    rooms = self._index[dimension][value]
+                    rooms.discard(room)
+                    if not rooms:
+                        del self._index[dimension][value]
+        return room
+
+    def match(self, signal):
+        """Rooms whose filters accept this signal"""
+        with self._lock:
+            matched = None
+            for dimension in DIMENSIONS:
+                index = self._index[dimension]
+                value = signal.get(SIGNAL_FIELDS[dimension])
+                rooms = index.get(value, set()) | index.get(WILDCARD, set())
+                matched = rooms if matched is None else matched & rooms
+                if not matched:
+                    return set()
+            return matched
+
+    def room_of(self, sid):
+        return self._client_room.get(sid)
+
+    def filters_of(self, room):
+        return self._filters.get(room)
+
+    def room_sizes(self):
+        """Member count per filter room"""
+        return {room: len(members) for room, members in self._members.items()}
+
+def normalise_filters(filters):
+    """
+    Turn a client filter payload into sorted tuples, None meaning 'everything'
+    Raises ValueError unless it is a dict of string lists (or single strings)
+    """
+    if filters is None:
+        filters = {}
+    if not isinstance(filters, dict):
+        raise ValueError(f"filters must be an object, got {type(filters).__name__}")
+
+    normalised = {}
+    for dimension in DIMENSIONS:
+        values = filters.get(dimension)
+        if values is None:
+            values = []
+        elif isinstance(values, str):
+            values = [values]
+        elif not isinstance(values, (list, tuple)) or not all(isinstance(v, str) for v in values):
+            raise ValueError(f"{dimension} must be a list of strings")
+        values = tuple(sorted({v for v in values if v and v != WILDCARD}))
+        normalised[dimension] = values or None
+    return normalised
+
+def room_name(normalised):
+    """Stable room name for a normalised filter"""
+    if not any(normalised.values()):
+        return 'signals:all'
+    key = '|'.join(','.join(normalised[d] or (WILDCARD,)) for d in DIMENSIONS)
+    return 'signals:' + hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
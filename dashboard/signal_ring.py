@@ -0,0 +1,69 @@
+import time
+
+class SignalRing:
+    """
+    Fixed-capacity ring of the newest items with a monotonic sequence number.
+
+    append() writes one slot, so it is O(1) whatever the capacity, and the
+    sequence number it returns is never reused, which makes it a stable id
+    for clients syncing deltas. The writer may pass its own increasing
+    sequence numbers instead (e.g. the producer's, gaps allowed), and
+    reset() starts the numbering over. Readers never lock the writer: snapshot()
+    copies the slots between two reads of a version counter that is odd
+    while a write is in progress (a seqlock), retries if it moved, and
+    caches the resulting newest-first tuple until the next append.
+    """
+    def __init__(self, capacity=20):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.seq = 0
+        self._count = 0               # Items appended since the last reset, positions the slots
+        self._slots = [None] * capacity
+        self._version = 0             # Odd while append() is writing
+        self._snapshot = (0, 0, ())   # (version, seq, newest-first items)
+
+    def append(self, item, seq=None):
+        """
+        Store item, replacing the oldest one when full; single writer only.
+        Returns its sequence number, seq when given (it must be above the last one)
+        """
+        if seq is None:
+            seq = self.seq + 1
+        elif seq <= self.seq:
+            raise ValueError(f"sequence number {seq} is not above {self.seq}")
+        self._version += 1
+        self._slots[self._count % self.capacity] = item
+        self._count += 1
+        self.seq = seq
+        self._version += 1
+        return seq
+
+    def reset(self):
+        """Drop every item and start the sequence over; single writer only"""
+        self._version += 1
+        self._slots = [None] * self.capacity
+        self._count = 0
+        self.seq = 0
+        self._version += 1
+
+    def snapshot(self):
+        """(seq, newest-first tuple of items), consistent even while the writer is appending"""
+        while True:
+            version = self._version
+            cached_version, seq, items = self._snapshot
+            if version == cached_version:
+                return seq, items
+            if version % 2 == 0:
+                seq, count = self.seq, self._count
+                slots = list(self._slots)
+                if self._version == version:
+                    break
+            time.sleep(0)  # Let the writer finish
+
+        items = tuple(slots[(count - 1 - i) % self.capacity] for i in range(min(count, self.capacity)))
+        self._snapshot = (version, seq, items)
+        return seq, items
+
+    def __len__(self):
+        return min(self._count, self.capacity)
@@ -2,120 +2,156 @@ import signal
 import sys
 import threading
 import time
-from core.websocket_client import QuotexWebSocketClient
-from core.data_processor import DataProcessor
-from core.strategy_engine import StrategyEngine
+from core.bot import QuotexTradingBot
+from core.signal_journal import journal
+from core.metrics import metrics
+from core.tracing import tracer
 from utils.logger import setup_logger
-from config.settings import TRADING_SETTINGS
-
-print(f"Python version: {sys.version}")
+from utils.startup import startup
+from config.settings import BUS_SETTINGS, READINESS_SETTINGS, SHARD_SETTINGS
+from config.live_config import live_config
 
 logger = setup_logger('main')
 
-class QuotexTradingBot:
-    def __init__(self):
-        self.ws_client = QuotexWebSocketClient()
-        self.data_processor = DataProcessor()
-        self.strategy_engine = StrategyEngine(self.data_processor)
-        self.running = False
-        
-    def initialize(self):
-        """Initialize the trading bot"""
-        logger.info("Initializing Quotex Trading Bot...")
-        
-        # Connect to WebSocket (synchronous now)
-        connected = self.ws_client.connect()
-        if not connected:
-            logger.error("Failed to connect to WebSocket")
-            return False
-            
-        # Wait a bit for authentication
-        time.sleep(2)
-        
-        # Start keep-alive in background thread
-        self.keep_alive_thread = threading.Thread(target=self.ws_client.keep_alive, daemon=True)
-        self.keep_alive_thread.start()
-        
-        # Subscribe to assets
-        for asset in TRADING_SETTINGS['assets']:
-            for timeframe in TRADING_SETTINGS['timeframes']:
-                self.ws_client.subscribe_to_assets()  # This now handles all subscriptions
-                time.sleep(0.1)
-        
-        self.running = True
-        logger.info("Trading bot initialized successfully")
-        return True
-    
-    def run(self):
-        """Main trading bot loop"""
-        try:
-            logger.info("Bot started. Waiting for messages...")
-            
-            # The new WebSocket client handles messages via callbacks
-            # We just need to keep the main thread alive
-            while self.running:
-                time.sleep(1)
-                
-                # Check if still connected
-                if not self.ws_client.connected:
-                    logger.warning("WebSocket disconnected. Attempting reconnect...")
-                    self.initialize()  # Reinitialize
-                    
-        except Exception as e:
-            logger.error(f"Error in main loop: {e}")
-        finally:
-            self.running = False
-            self.ws_client.disconnect()
-    
-    def shutdown(self):
-        """Graceful shutdown"""
-        logger.info("Shutting down trading bot...")
-        self.running = False
-        self.ws_client.disconnect()
-
-# Create bot instance
-bot = QuotexTradingBot()
-
-# ===== FIX: Define callback and assign BEFORE starting bot =====
+_sink = None
+# Built by create_runner() in the real entry point only
+bot = None
+runner = None
+
+def get_sink():
+    """
+    Where the bot delivers signals, outcomes and chart data: the in-process
+    dashboard, or the signal bus when running as the dedicated producer
+    """
+    global _sink
+    if _sink is None:
+        if BUS_SETTINGS['mode'] == 'producer':
+            from core.signal_bus import BusPublisher
+            _sink = BusPublisher(
+                BUS_SETTINGS['socket_path'],
+                max_pending=BUS_SETTINGS['max_pending'],
+                replay=BUS_SETTINGS['replay'],
+                status_provider=producer_status,
+                status_interval=BUS_SETTINGS['status_interval']
+            ).start()
+        else:
+            # Import here to avoid circular import
+            from dashboard.app import dashboard
+            _sink = dashboard
+    return _sink
+
+def producer_status():
+    """Status shipped to dashboard workers when the bot runs as a separate producer"""
+    return {'metrics': metrics.snapshot(), 'traces': tracer.recent(100), 'clock_offset': tracer.clock.offset,
+            'readiness': runner.readiness()}
+
+def publish_outcome(outcome):
+    """Forward resolved signal outcomes to the dashboard"""
+    get_sink().record_outcome(outcome)
+
+def publish_chart(asset, timeframe, rows):
+    """Forward candles and indicator values to dashboard chart subscribers"""
+    get_sink().publish_chart(asset, timeframe, rows)
+
+def emit_signal(signal):
+    """Persist a new signal and hand it to the dashboard or the signal bus"""
+    labels = {k: signal.get(k) for k in ('asset', 'timeframe', 'strategy')}
+    trace = signal.get('trace')
+    start = time.perf_counter()
+    journal.append(signal)
+    if trace:
+        trace.mark('store')
+    stored = time.perf_counter()
+    get_sink().add_signal(signal)
+    metrics.observe('store', stored - start, **labels)
+    metrics.observe('dispatch', time.perf_counter() - stored, **labels)
+    logger.info(f"New trading signal: {signal}")
+
 def process_websocket_message(message):
     """Callback function for WebSocket messages"""
     try:
-        processed_data = bot.data_processor.process_message(message)
-        if processed_data:
-            signal = bot.strategy_engine.process_data(processed_data)
-            if signal and signal.get('signal') != 'hold':
-                # Import here to avoid circular import
-                from dashboard.app import dashboard
-                dashboard.add_signal(signal)
-                logger.info(f"New trading signal: {signal}")
+        signal = bot.handle_message(message)
+        if signal:
+            emit_signal(signal)
     except Exception as e:
         logger.error(f"Error processing message: {e}")
+        metrics.error('pipeline')
 
-# Set the callback in the WebSocket client (BEFORE starting bot)
-bot.ws_client.on_message_callback = process_websocket_message
+def create_runner():
+    """Create the bot, and the shard coordinator when BOT_SHARDS > 1, for this process"""
+    global bot, runner
+    bot = QuotexTradingBot(on_outcome=publish_outcome, on_chart=publish_chart)
+    # Set the callback in the WebSocket client (BEFORE starting bot)
+    bot.ws_client.on_message_callback = process_websocket_message
 
-def run_bot():
-    """Run the trading bot in background"""
-    if bot.initialize():
-        bot.run()
+    # BOT_SHARDS > 1: the assets are split over that many worker processes, each with
+    # its own connection and pipeline, and their signals are merged back here
+    if SHARD_SETTINGS['shards'] > 1:
+        from core.sharding import ShardCoordinator
+        runner = ShardCoordinator(SHARD_SETTINGS['shards'], on_signal=emit_signal,
+                                  on_outcome=publish_outcome, on_chart=publish_chart)
+    else:
+        runner = bot
 
-# ===== RENDER DEPLOYMENT SETUP =====
-from dashboard.app import app
+def watch_live_config():
+    """Apply the config file now and keep applying its changes to the running bot"""
+    live_config.load()
+    live_config.subscribe(runner.apply_settings)
+    live_config.start_watching()
 
-# Export for Gunicorn - Render will automatically find this
-application = app
+def run_bot():
+    """Run the trading bot (or the shard workers) in background"""
+    if runner.initialize():
+        runner.run()
 
-# Start bot immediately when module loads (Production)
-if not bot.running:
-    bot_thread = threading.Thread(target=run_bot, daemon=True)
-    bot_thread.start()
-    logger.info("Trading bot started in background thread")
+def start_dashboard(dashboard):
+    """Run the bot next to the dashboard (embedded) or feed it from the signal bus (consumer)"""
+    global bus_subscriber
+    if BUS_SETTINGS['mode'] == 'embedded':
+        dashboard.readiness_provider = runner.readiness
+        watch_live_config()
+        # Start the bot shortly after the module loads so the worker can boot and serve first;
+        # /ready reports 503 until the bot is connected, subscribed and warm
+        if not runner.running:
+            bot_thread = threading.Timer(READINESS_SETTINGS['bot_start_delay'], run_bot)
+            bot_thread.daemon = True
+            bot_thread.start()
+            logger.info(f"Trading bot starts in background thread in {READINESS_SETTINGS['bot_start_delay']}s")
+    elif BUS_SETTINGS['mode'] == 'consumer':
+        from core.signal_bus import BusSubscriber
+        bus_subscriber = BusSubscriber(BUS_SETTINGS['socket_path'], dashboard).start()
+        logger.info(f"Dashboard subscribed to signal bus at {BUS_SETTINGS['socket_path']}")
 
 # Clean shutdown handling for production
 def handle_shutdown(signum, frame):
     """Handle graceful shutdown"""
     logger.info("Received shutdown signal")
-    bot.shutdown()
+    runner.shutdown()
+
+# ===== RENDER DEPLOYMENT SETUP =====
+# BOT_MODE=embedded (default): every process runs its own bot next to the dashboard
+# BOT_MODE=producer: `python main.py` runs the one bot and publishes on the signal bus
+# BOT_MODE=consumer: web workers only serve the dashboard and subscribe to the bus
+#
+# Shard workers are spawned processes that import this file again as __mp_main__.
+# They run their own bot (core.sharding.run_shard), so none of this happens there
+if __name__ != '__mp_main__':
+    print(f"Python version: {sys.version}")
+    create_runner()
+
+    if BUS_SETTINGS['mode'] != 'producer':
+        with startup.timed('dashboard'):
+            from dashboard.app import app, dashboard
+
+        # Export for Gunicorn - Render will automatically find this
+        application = app
+        start_dashboard(dashboard)
+
+    signal.signal(signal.SIGTERM, handle_shutdown)
+    signal.signal(signal.SIGINT, handle_shutdown)
 
-signal.signal(signal.SIGTERM, handle_shutdown)
-signal.signal(signal.SIGINT, handle_shutdown)
+if __name__ == '__main__' and BUS_SETTINGS['mode'] == 'producer':
+    # Dedicated producer process: open the bus up front so workers can attach
+    get_sink()
+    watch_live_config()
+    run_bot()
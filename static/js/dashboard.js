@@ -4,7 +4,11 @@ class TradingDashboard {
         this.socket = io();
         this.performanceChart = null;
         this.distributionChart = null;
+        this.priceChart = null;
+        this.chartKey = null;
         this.signals = [];
+        this.filters = null;
+        this.charts = {};
         this.performanceData = {
             total_signals: 0,
             winning_signals: 0,
@@ -112,25 +116,73 @@ class TradingDashboard {
                 }
             }
         });
+
+        // Price Chart, fed by the chart stream of the selected asset
+        const priceCtx = document.getElementById('price-chart').getContext('2d');
+        this.priceChart = new Chart(priceCtx, {
+            type: 'line',
+            data: {
+                labels: [],
+                datasets: [{
+                    label: 'Close',
+                    data: [],
+                    borderColor: '#3498db',
+                    borderWidth: 1.5,
+                    pointRadius: 0,
+                    tension: 0
+                }]
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                animation: false,
+                plugins: {
+                    legend: {
+                        display: false
+                    },
+                    title: {
+                        display: true,
+                        text: 'Select an asset',
+                        font: {
+                            size: 16,
+                            weight: 'bold'
+                        }
+                    }
+                }
+            }
+        });
     }
 
     setupSocketListeners() {
-        // Performance updates
-        this.socket.on('performance_update', (data) => {
-            this.performanceData = data;
-            this.updatePerformanceStats();
-            this.updateCharts();
-        });
+        // Batched signals, outcomes and the latest performance snapshot
+        this.socket.on('signal_batch', (batch) => {
+            const signals = batch.signals || [];
+            signals.forEach(signal => this.addSignalToUI(signal));
+
+            if (signals.length === 1) {
+                this.showNotification(`New ${signals[0].direction} signal for ${signals[0].asset}`);
+            } else if (signals.length > 1) {
+                this.showNotification(`${signals.length} new signals`);
+            }
 
-        // New signals
-        this.socket.on('new_signal', (signal) => {
-            this.addSignalToUI(signal);
-            this.showNotification(`New ${signal.direction} signal for ${signal.asset}`);
+            if (batch.performance) {
+                this.performanceData = batch.performance;
+                this.updatePerformanceStats();
+                this.updateCharts();
+            }
         });
 
         // Connection status
         this.socket.on('connect', () => {
             this.updateConnectionStatus('Online', 'status-online');
+            // Restore server-side filters after a reconnect
+            if (this.filters) {
+                this.socket.emit('subscribe_filters', this.filters);
+            }
+            // The server forgets chart subscriptions on disconnect
+            if (this.chartKey) {
+                this.subscribeChart(this.chartKey.asset, this.chartKey.timeframe);
+            }
             this.socket.emit('clients_update');
         });
 
@@ -138,6 +190,19 @@ class TradingDashboard {
             this.updateConnectionStatus('Offline', 'status-offline');
         });
 
+        // Live chart deltas for subscribed (asset, timeframe) pairs
+        this.socket.on('chart_delta', (delta) => {
+            const candles = this.charts[`${delta.asset}:${delta.timeframe}`];
+            if (!candles) return;
+
+            if (delta.update && candles.length && candles[candles.length - 1].time === delta.update.time) {
+                Object.assign(candles[candles.length - 1], delta.update);
+            }
+            (delta.append || []).forEach(candle => candles.push(candle));
+            while (candles.length > 200) candles.shift();
+            this.renderPriceChart(delta.asset, delta.timeframe);
+        });
+
         this.socket.on('clients_update', (count) => {
             document.getElementById('clients').textContent = count;
         });
@@ -149,9 +214,16 @@ class TradingDashboard {
             this.loadInitialData();
         });
 
-        // Filter signals
+        // Filter signals, and ask the server to only route the selected asset
         document.getElementById('filter-asset').addEventListener('change', (e) => {
             this.filterSignals(e.target.value);
+            this.subscribeFilters(e.target.value === 'all' ? {} : { assets: [e.target.value] });
+            this.selectChart(e.target.value, document.getElementById('chart-timeframe').value);
+        });
+
+        // Price chart timeframe
+        document.getElementById('chart-timeframe').addEventListener('change', (e) => {
+            this.selectChart(document.getElementById('filter-asset').value, e.target.value);
         });
 
         // Search functionality
@@ -265,6 +337,49 @@ class TradingDashboard {
         });
     }
 
+    selectChart(asset, timeframe) {
+        // Follow one (asset, timeframe) at a time; 'all' has no single price series
+        if (this.chartKey) {
+            this.unsubscribeChart(this.chartKey.asset, this.chartKey.timeframe);
+        }
+        this.chartKey = asset === 'all' ? null : { asset, timeframe };
+        if (this.chartKey) {
+            this.subscribeChart(asset, timeframe);
+        } else {
+            this.renderPriceChart(null, null);
+        }
+    }
+
+    subscribeChart(asset, timeframe) {
+        this.socket.emit('chart_subscribe', { asset, timeframe }, (snapshot) => {
+            if (snapshot && snapshot.candles) {
+                this.charts[`${asset}:${timeframe}`] = snapshot.candles;
+                this.renderPriceChart(asset, timeframe);
+            }
+        });
+    }
+
+    unsubscribeChart(asset, timeframe) {
+        delete this.charts[`${asset}:${timeframe}`];
+        this.socket.emit('chart_unsubscribe', { asset, timeframe });
+    }
+
+    renderPriceChart(asset, timeframe) {
+        const key = this.chartKey;
+        if (key && (key.asset !== asset || key.timeframe !== timeframe)) return;
+
+        const candles = key ? this.charts[`${asset}:${timeframe}`] || [] : [];
+        this.priceChart.data.labels = candles.map(c => new Date(c.time * 1000).toLocaleTimeString());
+        this.priceChart.data.datasets[0].data = candles.map(c => c.close);
+        this.priceChart.options.plugins.title.text = key ? `${asset} ${timeframe}` : 'Select an asset';
+        this.priceChart.update('none');
+    }
+
+    subscribeFilters(filters) {
+        this.filters = filters;
+        this.socket.emit('subscribe_filters', filters);
+    }
+
     filterSignals(asset) {
         const filtered = asset === 'all' ? 
             this.signals : 
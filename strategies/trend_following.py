@@ -18,8 +18,11 @@ def calculate_stochastic(high, low, close, k_period=14, d_period=3):
     return stoch_k, stoch_d
 
 class TrendFollowingStrategy:
+    min_candles = 20  # Candles needed before analyze() can produce a signal
+
     def __init__(self, timeframe='1m'):
         self.timeframe = timeframe
+        self.last_frame = None  # Indicator frame from the latest analyze() call
         self.name = f"TrendFollowing_{timeframe}"
         
     def calculate_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -53,10 +56,11 @@ class TrendFollowingStrategy:
     
     def analyze(self, data: pd.DataFrame) -> Dict[str, Any]:
         """Trend Following Strategy Analysis"""
-        if len(data) < 20:
+        if len(data) < self.min_candles:
             return {'signal': 'hold', 'confidence': 0}
         
         df = self.calculate_indicators(data)
+        self.last_frame = df
         current = df.iloc[-1]
         prev = df.iloc[-2]
         
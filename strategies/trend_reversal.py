@@ -31,8 +31,11 @@ except ImportError:
         return tr.rolling(window=period).mean()
 
 class TrendReversalStrategy:
+    min_candles = 20  # Candles needed before analyze() can produce a signal
+
     def __init__(self, timeframe='5m'):
         self.timeframe = timeframe
+        self.last_frame = None  # Indicator frame from the latest analyze() call
         self.name = f"TrendReversal_{timeframe}"
         
     def calculate_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -136,10 +139,11 @@ class TrendReversalStrategy:
     
     def analyze(self, data: pd.DataFrame) -> Dict[str, Any]:
         """Analyze data and generate signals"""
-        if len(data) < 20:
+        if len(data) < self.min_candles:
             return {'signal': 'hold', 'confidence': 0}
         
         df = self.calculate_indicators(data)
+        self.last_frame = df
         current = df.iloc[-1]
         prev = df.iloc[-2]
         
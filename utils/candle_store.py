@@ -0,0 +1,79 @@
+import threading
+import numpy as np
+import pandas as pd
+
+OHLC = ('open', 'high', 'low', 'close')
+
+class CandleRing:
+    """
+    Fixed-capacity OHLC history for one (asset, period).
+
+    Candles live in a preallocated numpy array used as a ring, so appending
+    is O(1) and memory never grows. A candle with the same timestamp as the
+    newest one replaces it (the broker re-sends the forming candle).
+    """
+    __slots__ = ('capacity', '_values', '_times', '_head', '_size')
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._values = np.empty((capacity, len(OHLC)), dtype=np.float64)
+        self._times = np.empty(capacity, dtype=np.float64)
+        self._head = 0  # Next slot to write
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, candle):
+        """Store a candle dict, returns False if it updated the newest candle in place"""
+        ts = float(candle.get('time', candle.get('timestamp', 0)) or 0)
+        row = [float(candle[k]) for k in OHLC]
+        last = (self._head - 1) % self.capacity
+        if self._size and ts and self._times[last] == ts:
+            self._values[last] = row
+            return False
+
+        self._values[self._head] = row
+        self._times[self._head] = ts
+        self._head = (self._head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        return True
+
+    def window(self, size=None):
+        """Newest `size` candles oldest first, as an (n, 4) array copy"""
+        n = self._size if size is None else min(size, self._size)
+        start = (self._head - n) % self.capacity
+        if start + n <= self.capacity:
+            return self._values[start:start + n].copy()
+        return np.concatenate((self._values[start:], self._values[:self._head]))
+
+class CandleStore:
+    """Bounded candle history per (asset, period), shared by the helper pipeline"""
+    def __init__(self, capacity=200):
+        self.capacity = capacity
+        self._rings = {}
+        self._lock = threading.Lock()
+
+    def add(self, asset, period, candle):
+        key = (asset, period)
+        ring = self._rings.get(key)
+        if ring is None:
+            with self._lock:
+                ring = self._rings.setdefault(key, CandleRing(self.capacity))
+        return ring.append(candle)
+
+    def frame(self, asset, period, size=None):
+        """DataFrame of the newest candles (open/high/low/close), oldest first"""
+        ring = self._rings.get((asset, period))
+        values = ring.window(size) if ring is not None else np.empty((0, len(OHLC)))
+        return pd.DataFrame(values, columns=list(OHLC))
+
+    def size(self, asset, period):
+        ring = self._rings.get((asset, period))
+        return len(ring) if ring is not None else 0
+
+    def drop(self, asset, period=None):
+        """Forget history for an asset (or one of its periods) once unsubscribed"""
+        with self._lock:
+            for key in [k for k in self._rings if k[0] == asset and (period is None or k[1] == period)]:
+                del self._rings[key]
@@ -4,11 +4,13 @@ import threading
 import logging
 import socketio
 from datetime import datetime, timezone
-import pandas as pd
 from credentials import QUOTEX_SESSION_TOKEN
 from strategy import analyze_candles
-from telegram_utils import send_telegram_message
+from utils.notifier import telegram_notifier
 from config import get_dynamic_symbols, get_timeframes, add_candle
+from utils.logger import get_wire_logger
+from utils.market_selection import MarketSelection
+from utils.candle_store import CandleStore
 
 # -----------------------------
 # Debug logger setup
@@ -16,6 +18,7 @@ def setup_debug_logger():
     """Enable full debug logging for Socket.IO and our app."""
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.DEBUG)
+    # Wire loggers stay sampled (see get_wire_logger) even at DEBUG
     logging.getLogger("socketio").setLevel(logging.DEBUG)
     logging.getLogger("engineio").setLevel(logging.DEBUG)
     logging.debug("[DEBUG] Debug logger initialized")
@@ -29,23 +32,37 @@ socketio_instance = None
 
 # Python Socket.IO client (updated with correct path and debug level)
 sio = socketio.Client(
-    logger=logging.getLogger("socketio"),
-    engineio_logger=logging.getLogger("engineio"),
+    logger=get_wire_logger("socketio", logging.DEBUG),
+    engineio_logger=get_wire_logger("engineio", logging.DEBUG),
     reconnection=True,
     reconnection_attempts=0,
     reconnection_delay=5
 )
 
-# Store market data locally
-market_data = {}
+# Candles kept per (asset, period), enough history for analyze_candles
+CANDLE_WINDOW = 200
+# Store market data locally, bounded per (asset, period)
+market_data = CandleStore(capacity=CANDLE_WINDOW)
 # Track currently subscribed symbols/timeframes
 subscribed = {}  # {symbol: set(periods)}
 
+# Cached symbol/timeframe selection, refreshed from config on change only
+selection = MarketSelection(get_dynamic_symbols, get_timeframes)
+# How often to re-read the config sources for changes (seconds); code that changes
+# the selection should call reload_selection() so it applies at once
+SELECTION_REFRESH_INTERVAL = 5
+_sync_thread = None
+_sync_lock = threading.Lock()
+
 # -----------------------------
 @sio.event
 def connect():
     logging.info("[CONNECT] Connected to Quotex Socket.IO")
 
+    # A fresh connection has no subscriptions, let the sync worker replay them
+    subscribed.clear()
+    selection.request_resync()
+
     if not QUOTEX_SESSION_TOKEN:
         logging.error("[AUTH ERROR] No QUOTEX_SESSION_TOKEN found in .env")
         return
@@ -72,19 +89,15 @@ def handle_candle(data):
         asset = data["asset"]
         period = data["period"]
 
-        selected_symbols = get_dynamic_symbols()
-        selected_timeframes = get_timeframes()
-
-        if asset not in selected_symbols or period not in selected_timeframes:
+        if not selection.contains(asset, period):
             return
 
         # Store candle
         add_candle(asset, period, data)
-        candle_list = market_data.setdefault(asset, {}).setdefault("candles", {}).setdefault(period, [])
-        candle_list.append(data)
+        market_data.add(asset, period, data)
 
-        # Analyze candle
-        df = pd.DataFrame(candle_list)[["open", "high", "low", "close"]]
+        # Analyze the recent window only
+        df = market_data.frame(asset, period)
         result = analyze_candles(df)
 
         if result and result.get("signal"):
@@ -107,8 +120,8 @@ def handle_candle(data):
                 latest_signals.pop(0)
             socketio_instance.latest_signals = latest_signals
 
-            # Send Telegram alert
-            send_telegram_message(signal_obj)
+            # Queue Telegram alert, delivery happens off the candle path
+            telegram_notifier.submit(signal_obj)
 
     except Exception as e:
         logging.error(f"[CANDLE ERROR] {e}")
@@ -117,15 +130,15 @@ def handle_candle(data):
 @sio.on("*")
 def catch_all(event, data=None):
     try:
-        logging.debug(f"[CATCH-ALL] Event: {event} | Data: {str(data)[:500]}")
+        logging.debug("[CATCH-ALL] Event: %s | Data: %.500s", event, data)
     except Exception as e:
         logging.error(f"[CATCH-ALL ERROR] {e}")
 
 # -----------------------------
 def sync_subscriptions():
     global subscribed
-    selected_symbols = set(get_dynamic_symbols())
-    selected_timeframes = set(get_timeframes())
+    selected_symbols = selection.symbols
+    selected_timeframes = selection.timeframes
 
     # Subscribe new symbols/timeframes
     for symbol in selected_symbols:
@@ -149,6 +162,7 @@ def sync_subscriptions():
                     sio.emit("unsubscribe", {"type": "candles", "asset": symbol, "period": period})
                     logging.info(f"[UNSUBSCRIBE] Unsubscribed {symbol} from {period}s candles")
                     periods.remove(period)
+                    market_data.drop(symbol, period)
                 except Exception as e:
                     logging.error(f"[UNSUBSCRIBE ERROR] {symbol} {period}: {e}")
         if not periods:
@@ -156,12 +170,39 @@ def sync_subscriptions():
 
 # -----------------------------
 def subscription_sync_worker():
+    """Diff and (un)subscribe only when the selection changes or a resync is requested"""
+    synced_version = None
     while True:
         try:
-            sync_subscriptions()
+            version = selection.wait_for_change(synced_version, timeout=SELECTION_REFRESH_INTERVAL)
+            if version == synced_version:
+                # Nothing pushed, re-read config sources; a change bumps the version
+                selection.refresh()
+                continue
+            if sio.connected:
+                sync_subscriptions()
+            # While disconnected there is nothing to sync, the connect handler requests a resync
+            synced_version = version
         except Exception as e:
             logging.error(f"[SYNC ERROR] {e}")
-        time.sleep(5)
+            time.sleep(5)
+
+def reload_selection():
+    """Re-read the symbol/timeframe sources now, e.g. after a config change; returns True if it changed"""
+    try:
+        return selection.refresh()
+    except Exception as e:
+        logging.error(f"[SELECTION ERROR] {e}")
+        return False
+
+def ensure_sync_worker():
+    """Start the subscription sync worker once per process"""
+    global _sync_thread
+    with _sync_lock:
+        if _sync_thread is None or not _sync_thread.is_alive():
+            selection.refresh()
+            _sync_thread = threading.Thread(target=subscription_sync_worker, daemon=True)
+            _sync_thread.start()
 
 # -----------------------------
 def run_quotex_ws(socketio_from_app):
@@ -191,8 +232,8 @@ def run_quotex_ws(socketio_from_app):
 
             logging.info("[AUTH] Connected to Quotex WebSocket ✅")
 
-            # Start subscription sync worker
-            threading.Thread(target=subscription_sync_worker, daemon=True).start()
+            # Start subscription sync worker (no-op if already running)
+            ensure_sync_worker()
 
             # Wait indefinitely for events
             sio.wait()
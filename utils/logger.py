@@ -1,34 +1,166 @@
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
 import os
-from datetime import datetime
+import queue
+import re
+import threading
+from datetime import datetime, timezone
+
+LOG_DIR = os.getenv('LOG_DIR', 'logs')
+# Every process writes its own file (bot.<pid>.log), rotation is never shared;
+# files of processes that are gone are removed when the next process starts logging
+LOG_FILE = os.getenv('LOG_FILE', 'bot.log')
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', '5'))
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+# Keep one in N debug/info records from the Socket.IO wire loggers
+LOG_WIRE_SAMPLE = int(os.getenv('LOG_WIRE_SAMPLE', '100'))
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'msg': record.getMessage()
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to the background listener without formatting them.
+
+    The caller only pays for merging msg and args, which must happen here
+    because the args may change or go away before the listener gets to them,
+    and a put_nowait; timestamps and the output formats are left to the
+    listener thread. If the queue is full the record is dropped rather than
+    blocking the caller.
+    """
+    dropped = 0
+
+    def prepare(self, record):
+        # Same as the stdlib, minus formatting the whole line
+        message = record.getMessage()
+        record = copy.copy(record)
+        record.message = message
+        record.msg = message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            NonBlockingQueueHandler.dropped += 1
+
+class SamplingFilter(logging.Filter):
+    """Pass one in every N records below WARNING, warnings and errors always pass"""
+    def __init__(self, every):
+        super().__init__()
+        self.every = max(1, every)
+        self._seen = 0
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        self._seen += 1
+        return (self._seen - 1) % self.every == 0
+
+_queue_handler = None
+_listener = None
+_init_lock = threading.Lock()
+
+def _get_queue_handler():
+    """Create the shared queue, listener thread and output handlers once per process"""
+    global _queue_handler, _listener
+    if _queue_handler is not None:
+        return _queue_handler
+
+    with _init_lock:
+        if _queue_handler is None:
+            # Create logs directory if it doesn't exist
+            if not os.path.exists(LOG_DIR):
+                os.makedirs(LOG_DIR, exist_ok=True)
+            _prune_dead_logs()
+
+            # Console handler
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+
+            # Rotating JSON-lines file shared by every logger of this process
+            file_handler = logging.handlers.RotatingFileHandler(
+                _log_path(), maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT
+            )
+            file_handler.setFormatter(JsonFormatter())
+
+            log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+            _listener = logging.handlers.QueueListener(log_queue, console_handler, file_handler)
+            _listener.start()
+            atexit.register(_listener.stop)
+            _queue_handler = NonBlockingQueueHandler(log_queue)
+    return _queue_handler
+
+def _log_path():
+    """
+    This process's log file: gunicorn workers, the producer and shard workers
+    each rotate their own, since a RotatingFileHandler shared between
+    processes renames the file from under the others
+    """
+    stem, ext = os.path.splitext(LOG_FILE)
+    return os.path.join(LOG_DIR, f"{stem}.{os.getpid()}{ext or '.log'}")
+
+def _prune_dead_logs():
+    """Remove bot.<pid>.log files (and their backups) of processes that no longer run"""
+    stem, ext = os.path.splitext(LOG_FILE)
+    pattern = re.compile(rf"{re.escape(stem)}\.(\d+){re.escape(ext or '.log')}(\.\d+)?")
+    try:
+        names = os.listdir(LOG_DIR)
+    except OSError:
+        return
+    for name in names:
+        match = pattern.fullmatch(name)
+        if match and not _pid_alive(int(match.group(1))):
+            try:
+                os.remove(os.path.join(LOG_DIR, name))
+            except OSError:
+                pass
+
+def _pid_alive(pid):
+    if pid == os.getpid() or os.name == 'nt':
+        return True  # Signal 0 is CTRL_C_EVENT on Windows, never probe there
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # Exists, owned by another user
+    return True
 
 def setup_logger(name, log_level=logging.INFO):
-    """Setup logger with console and file handlers"""
-    
-    # Create logs directory if it doesn't exist
-    if not os.path.exists('logs'):
-        os.makedirs('logs')
-    
-    # Create logger
+    """Setup logger that enqueues records for the background console/file writer"""
     logger = logging.getLogger(name)
     logger.setLevel(log_level)
-    
+
     # Remove existing handlers
     logger.handlers.clear()
-    
-    # Create formatters
-    console_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
-    
-    # File handler
-    log_file = f"logs/{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
-    
+    logger.addHandler(_get_queue_handler())
+    return logger
+
+def get_wire_logger(name, log_level=logging.INFO, sample_every=None):
+    """Logger for chatty protocol libraries (socketio/engineio) with sampling"""
+    logger = setup_logger(name, log_level)
+    logger.filters.clear()
+    logger.addFilter(SamplingFilter(sample_every or LOG_WIRE_SAMPLE))
     return logger
@@ -0,0 +1,47 @@
+import threading
+
+class MarketSelection:
+    """
+    Versioned set of selected symbols and timeframes with change notifications.
+
+    Readers do O(1) membership checks against immutable frozensets. The
+    version only moves when the selection really changes (or a resync is
+    requested), and waiters are woken exactly then.
+    """
+    def __init__(self, load_symbols=None, load_timeframes=None):
+        self._load_symbols = load_symbols
+        self._load_timeframes = load_timeframes
+        self.symbols = frozenset()
+        self.timeframes = frozenset()
+        self.version = 0
+        self._cond = threading.Condition()
+
+    def contains(self, asset, period):
+        return asset in self.symbols and period in self.timeframes
+
+    def refresh(self):
+        """Re-read the configured sources, returns True if the selection changed"""
+        return self.update(self._load_symbols(), self._load_timeframes())
+
+    def update(self, symbols, timeframes):
+        """Replace the selection, notifying waiters only if something changed"""
+        symbols, timeframes = frozenset(symbols), frozenset(timeframes)
+        with self._cond:
+            if symbols == self.symbols and timeframes == self.timeframes:
+                return False
+            self.symbols, self.timeframes = symbols, timeframes
+            self.version += 1
+            self._cond.notify_all()
+        return True
+
+    def request_resync(self):
+        """Wake waiters without changing the selection, e.g. after a reconnect"""
+        with self._cond:
+            self.version += 1
+            self._cond.notify_all()
+
+    def wait_for_change(self, seen_version, timeout=None):
+        """Block until the version differs from seen_version (or timeout), returns the current version"""
+        with self._cond:
+            self._cond.wait_for(lambda: self.version != seen_version, timeout)
+            return self.version
@@ -0,0 +1,136 @@
+import queue
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from config.credentials import Credentials
+from utils.logger import setup_logger
+
+logger = setup_logger('notifier')
+
+class TelegramNotifier:
+    """
+    Background Telegram sender for trading signals.
+
+    submit() only puts the signal on a bounded queue and returns. A single
+    worker thread merges bursts into one message, keeps to Telegram's
+    per-chat rate limit, and retries failures with exponential backoff
+    (honouring retry_after on HTTP 429). api_base can point at a local HTTP
+    server for testing.
+    """
+    def __init__(self, token=None, chat_id=None, api_base=None, max_queue=500,
+                 batch_window=1.0, max_batch=20, min_interval=1.0, max_retries=5, timeout=10):
+        self.token = token if token is not None else Credentials.TELEGRAM_BOT_TOKEN
+        self.chat_id = chat_id if chat_id is not None else Credentials.TELEGRAM_CHAT_ID
+        self.api_base = (api_base or Credentials.TELEGRAM_API_BASE).rstrip('/')
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.min_interval = min_interval  # Telegram allows about one message per second per chat
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._worker = None
+        self._start_lock = threading.Lock()
+        self._last_sent = 0.0
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+
+        # Pooled keep-alive connection to the Bot API
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        self.session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+
+    @property
+    def enabled(self):
+        return bool(self.token and self.chat_id)
+
+    def submit(self, signal):
+        """Queue a signal for delivery, never blocks; returns False if not queued"""
+        if not self.enabled:
+            return False
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(signal)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(f"Telegram queue full, dropped {self.dropped} notifications so far")
+            return False
+
+    def _ensure_worker(self):
+        if self._worker is not None:
+            return
+        with self._start_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name='telegram-notifier', daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            # Merge whatever arrives within the window into the same message
+            deadline = time.monotonic() + self.batch_window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._send_with_retry(format_signals(batch))
+
+    def _send_with_retry(self, text):
+        delay = 1.0
+        for attempt in range(1, self.max_retries + 1):
+            wait = self._last_sent + self.min_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+
+            retry_after = None
+            try:
+                response = self.session.post(
+                    f"{self.api_base}/bot{self.token}/sendMessage",
+                    json={'chat_id': self.chat_id, 'text': text},
+                    timeout=self.timeout
+                )
+                self._last_sent = time.monotonic()
+                if response.status_code == 200:
+                    self.sent += 1
+                    return True
+                if response.status_code == 429:
+                    try:
+                        retry_after = response.json().get('parameters', {}).get('retry_after')
+                    except ValueError:
+                        pass
+                elif 400 <= response.status_code < 500:
+                    # Bad token/chat or malformed request, retrying will not help
+                    logger.error(f"Telegram rejected message: {response.status_code} - {response.text[:200]}")
+                    break
+                logger.warning(f"Telegram send failed ({response.status_code}), attempt {attempt}")
+            except requests.RequestException as e:
+                logger.warning(f"Telegram send error: {e}, attempt {attempt}")
+
+            if attempt == self.max_retries:
+                break
+            time.sleep(retry_after if retry_after else delay)
+            delay = min(delay * 2, 60)
+
+        self.failed += 1
+        logger.error("Giving up on Telegram notification")
+        return False
+
+def format_signals(signals):
+    """One line per signal, with a header when several are merged"""
+    lines = [
+        f"{s.get('symbol', s.get('asset', '?'))} {str(s.get('signal', '')).upper()} "
+        f"({s.get('timeframe', '')}) confidence {s.get('confidence', 0)}% at {s.get('time', s.get('timestamp', ''))}"
+        for s in signals
+    ]
+    if len(lines) > 1:
+        lines.insert(0, f"{len(lines)} new signals:")
+    return '\n'.join(lines)
+
+# Shared notifier, disabled unless TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID are set
+telegram_notifier = TelegramNotifier()
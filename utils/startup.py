@@ -0,0 +1,63 @@
+import importlib
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+class StartupProfile:
+    """
+    Records how long each heavy import and initialization step takes.
+
+    Heavy modules (pandas, socketio, cloudscraper, the strategies) are
+    imported through lazy_import() on first use rather than when main.py is
+    loaded, and each one is timed the first time it is actually imported.
+    """
+    def __init__(self):
+        self.started = time.time()
+        self.ready_at = None
+        self._steps = []  # (kind, name, seconds, finished_at)
+        self._lock = threading.Lock()
+
+    def lazy_import(self, module_name):
+        """Import a module on first use, recording the import time"""
+        module = sys.modules.get(module_name)
+        if module is not None:
+            return module
+        with self.timed(module_name, kind='import'):
+            return importlib.import_module(module_name)
+
+    @contextmanager
+    def timed(self, name, kind='init'):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(kind, name, time.perf_counter() - start)
+
+    def mark_ready(self):
+        """Remember when the process first became ready, returns True the first time"""
+        with self._lock:
+            if self.ready_at is not None:
+                return False
+            self.ready_at = time.time()
+            return True
+
+    def snapshot(self):
+        with self._lock:
+            steps = list(self._steps)
+        return {
+            'started': self.started,
+            'ready_after': round(self.ready_at - self.started, 3) if self.ready_at else None,
+            'steps': [
+                {'kind': kind, 'name': name, 'ms': round(seconds * 1000, 1),
+                 'at': round(finished - self.started, 3)}
+                for kind, name, seconds, finished in steps
+            ]
+        }
+
+    def _record(self, kind, name, seconds):
+        with self._lock:
+            self._steps.append((kind, name, seconds, time.time()))
+
+# Process-wide startup profile
+startup = StartupProfile()